@@ -1,36 +1,43 @@
 """Main Flask application for network optimizer API."""
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 from datetime import datetime, timedelta
 import sys
+import threading
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import CORS_ORIGINS, API_HOST, API_PORT, DEBUG
-from models.data_loader import DataLoader
-from models.signal_strength_predictor import SignalStrengthPredictor
-from models.network_usage_analyzer import NetworkUsageAnalyzer
-from models.time_pattern_analyzer import TimePatternAnalyzer
-from models.location_demand_mapper import LocationDemandMapper
-from models.throughput_forecaster import ThroughputForecaster
+from config import CORS_ORIGINS, API_HOST, API_PORT, DEBUG, PARTITIONS_DIR, SHARD_INDEX, SHARD_COUNT
+from utils import instrumentation, responses
+from utils.instrumentation import stage, training_stage, record_cache
+from utils.responses import bump_version, conditional, json_response, set_version_source
+from utils.lazy import LazyComponent
 
 app = Flask(__name__)
 CORS(app, origins=CORS_ORIGINS)
-
-# Initialize components
-data_loader = DataLoader()
-signal_predictor = SignalStrengthPredictor()
-network_analyzer = NetworkUsageAnalyzer()
-time_analyzer = TimePatternAnalyzer()
-location_mapper = LocationDemandMapper()
-throughput_forecaster = ThroughputForecaster()
+instrumentation.init_app(app)
+responses.init_app(app)
+
+# Initialize components (imported on first use so the app starts fast)
+data_loader = LazyComponent('models.data_loader', 'DataLoader')
+signal_predictor = LazyComponent('models.signal_strength_predictor', 'SignalStrengthPredictor')
+network_analyzer = LazyComponent('models.network_usage_analyzer', 'NetworkUsageAnalyzer')
+time_analyzer = LazyComponent('models.time_pattern_analyzer', 'TimePatternAnalyzer')
+location_mapper = LazyComponent('models.location_demand_mapper', 'LocationDemandMapper')
+throughput_forecaster = LazyComponent('models.throughput_forecaster', 'ThroughputForecaster')
+degradation_detector = LazyComponent('utils.degradation', 'DegradationDetector')
+
+# Published dataset versions; requests read immutable snapshots without locking
+dataset_store = LazyComponent('utils.snapshots', 'SnapshotStore')
+set_version_source('dataset', lambda: dataset_store.version if dataset_store.is_loaded else 0)
 
 # Global state
 models_loaded = False
 training_in_progress = False
+model_init_thread = None
 
 
 def initialize_models():
@@ -48,27 +55,32 @@ def initialize_models():
     try:
         # Load data
         print("\n[1/6] Loading dataset...")
-        df = data_loader.load_data()
+        with training_stage('load_data'):
+            df = dataset_store.publish(_load_dataset(data_loader.load_data)).frame
         print(f"Loaded {len(df)} records")
         
         # Train models
         print("\n[2/6] Training Signal Strength Predictor...")
-        signal_predictor.train(df)
-        signal_predictor.load_models()
+        with training_stage('train_signal_strength'):
+            signal_predictor.train(df)
+            signal_predictor.load_models()
         
         print("\n[3/6] Training Throughput Forecaster...")
-        throughput_forecaster.train(df)
-        throughput_forecaster.load_models()
+        with training_stage('train_throughput'):
+            throughput_forecaster.train(df)
+            throughput_forecaster.load_models()
         
         print("\n[4/6] Initializing analyzers...")
         # These don't need training, just initialization
         
         print("\n[5/6] Loading saved models...")
-        signal_predictor.load_models()
-        throughput_forecaster.load_models()
+        with training_stage('load_models'):
+            signal_predictor.load_models()
+            throughput_forecaster.load_models()
         
         print("\n[6/6] Models initialized successfully!")
         models_loaded = True
+        bump_version('models')
         
     except Exception as e:
         print(f"Error initializing models: {e}")
@@ -78,60 +90,132 @@ def initialize_models():
         training_in_progress = False
 
 
-# Initialize models on startup (non-blocking)
-import threading
-model_init_thread = threading.Thread(target=initialize_models, daemon=True)
-model_init_thread.start()
+def start_background_training():
+    """Initialize models in a background thread (non-blocking)."""
+    global model_init_thread
+    
+    if model_init_thread is None or not model_init_thread.is_alive():
+        model_init_thread = threading.Thread(target=initialize_models, daemon=True)
+        model_init_thread.start()
+    return model_init_thread
+
+
+def _load_dataset(load=None):
+    """
+    Load the dataset; a shard worker keeps only the localities it owns.
+
+    When ``preprocess_chunked`` has written Locality partitions they are read
+    directly and DataLoader is never built. Otherwise the loader's cache is
+    released afterwards, so the published snapshot is the only copy in
+    memory. Shard workers bypass DataLoader, whose cache would hold the full
+    dataset.
+    """
+    if SHARD_COUNT > 1:
+        from utils.sharding import load_shard_data
+        return load_shard_data(SHARD_INDEX, SHARD_COUNT)
+    from utils.preprocessing import DataPreprocessor
+    preprocessor = DataPreprocessor()
+    if preprocessor.partition_localities(PARTITIONS_DIR):
+        print(f"Loading preprocessed partitions from {PARTITIONS_DIR}")
+        return preprocessor.load_partitions(PARTITIONS_DIR)
+    df = (load or data_loader.get_data)()
+    # The snapshot takes ownership of the frame; drop the loader and its cached reference
+    data_loader.release()
+    return df
+
+
+def get_dataset():
+    """Read-only view of the current dataset snapshot, loading it on first use."""
+    record_cache('dataset', dataset_store.current() is not None)
+    return dataset_store.get_or_load(_load_dataset).frame
+
+
+# Harmonic signal strength model and the dataset snapshot version it was fitted on
+_harmonic_model = (None, None)
+
+
+def get_harmonic_forecaster():
+    """Harmonic forecaster for the current dataset snapshot, refitted after each publish."""
+    global _harmonic_model
+    df = get_dataset()
+    version = dataset_store.version
+    record_cache('harmonic_forecaster', _harmonic_model[0] == version)
+    if _harmonic_model[0] != version:
+        from utils.harmonic_forecaster import HarmonicForecaster
+        _harmonic_model = (version, HarmonicForecaster().fit(df, 'Signal_Strength'))
+    return _harmonic_model[1]
+
+
+def record_component_load(cache, component):
+    """Record whether a lazily constructed component was already in memory."""
+    record_cache(cache, component.is_loaded)
+
+
+def filter_rows(df, locality=None, network_type=None):
+    """Rows of ``df`` for ``locality`` and/or ``network_type`` (all rows when both are None)."""
+    if locality is None and network_type is None:
+        return df
+    with stage('filter'):
+        mask = True
+        if locality is not None:
+            mask = mask & (df['Locality'] == locality)
+        if network_type is not None:
+            mask = mask & (df['Network_Type'] == network_type)
+        return df[mask]
 
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
+    health = {
         'status': 'healthy',
         'models_loaded': models_loaded,
         'timestamp': datetime.now().isoformat()
-    })
+    }
+    if SHARD_COUNT > 1:
+        health['shard'] = {'index': SHARD_INDEX, 'count': SHARD_COUNT}
+    return jsonify(health)
 
 
 # Core data endpoints
 @app.route('/api/localities', methods=['GET'])
+@conditional('dataset')
 def get_localities():
     """Get list of all localities."""
     try:
-        df = data_loader.get_data()
-        localities = data_loader.get_localities()
-        
-        # Get coordinates for each locality
-        localities_with_coords = []
-        for locality in localities:
-            locality_data = data_loader.get_locality_data(locality)
-            if len(locality_data) > 0:
-                lat = locality_data['Latitude'].mean() if 'Latitude' in locality_data.columns else 0
-                lon = locality_data['Longitude'].mean() if 'Longitude' in locality_data.columns else 0
-                localities_with_coords.append({
-                    'name': locality,
-                    'coordinates': {
-                        'latitude': float(lat),
-                        'longitude': float(lon)
-                    }
-                })
+        with stage('data_fetch'):
+            df = get_dataset()
         
-        return jsonify({
-            'localities': localities_with_coords,
-            'total': len(localities_with_coords)
-        })
+        # Localities of the pinned snapshot and their mean coordinates in one grouped pass
+        with stage('aggregate'):
+            grouped = df.groupby('Locality', observed=True, sort=True)
+            coord_cols = [col for col in ('Latitude', 'Longitude') if col in df.columns]
+            coords = grouped[coord_cols].mean().reindex(columns=['Latitude', 'Longitude'], fill_value=0)
+            present = coords.index.tolist()
+            localities_with_coords = [
+                {'name': locality, 'coordinates': {'latitude': lat, 'longitude': lon}}
+                for locality, lat, lon in zip(present, coords['Latitude'].tolist(), coords['Longitude'].tolist())
+            ]
+        
+        with stage('serialize'):
+            return json_response({
+                'localities': localities_with_coords,
+                'total': len(localities_with_coords)
+            })
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'LOCALITIES_ERROR'}), 500
 
 
 @app.route('/api/network-types', methods=['GET'])
+@conditional('dataset')
 def get_network_types():
     """Get list of network types."""
     try:
-        network_types = data_loader.get_network_types()
-        return jsonify({
+        with stage('data_fetch'):
+            df = get_dataset()
+        network_types = sorted(str(value) for value in df['Network_Type'].dropna().unique())
+        return json_response({
             'network_types': network_types,
             'total': len(network_types)
         })
@@ -140,10 +224,12 @@ def get_network_types():
 
 
 @app.route('/api/data/summary', methods=['GET'])
+@conditional('dataset')
 def get_data_summary():
     """Get overall dataset statistics."""
     try:
-        df = data_loader.get_data()
+        with stage('data_fetch'):
+            df = get_dataset()
         
         summary = {
             'total_records': len(df),
@@ -157,20 +243,74 @@ def get_data_summary():
         
         # Add statistics for numeric columns
         numeric_cols = ['Signal_Strength', 'Data_Throughput', 'Latency']
-        for col in numeric_cols:
-            if col in df.columns:
-                summary[col.lower()] = {
-                    'mean': float(df[col].mean()),
-                    'std': float(df[col].std()),
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                }
-        
-        return jsonify(summary)
+        with stage('aggregate'):
+            for col in numeric_cols:
+                if col in df.columns:
+                    summary[col.lower()] = {
+                        'mean': float(df[col].mean()),
+                        'std': float(df[col].std()),
+                        'min': float(df[col].min()),
+                        'max': float(df[col].max()),
+                    }
+        
+        with stage('serialize'):
+            return json_response(summary)
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'SUMMARY_ERROR'}), 500
 
 
+@app.route('/api/shard/summary', methods=['GET'])
+@conditional('dataset')
+def get_shard_summary():
+    """Mergeable partial statistics of this worker's data, gathered by the shard router."""
+    try:
+        from utils.sharding import summary_partials
+        
+        with stage('data_fetch'):
+            df = get_dataset()
+        with stage('aggregate'):
+            partials = summary_partials(df)
+        partials['shard'] = {'index': SHARD_INDEX, 'count': SHARD_COUNT}
+        return json_response(partials)
+    except Exception as e:
+        return jsonify({'error': str(e), 'code': 'SUMMARY_ERROR'}), 500
+
+
+@app.route('/api/shard/time-patterns', methods=['GET'])
+@conditional('dataset')
+def get_shard_time_patterns():
+    """Per hour-and-day sums and counts of a metric, merged into time patterns by the shard router."""
+    try:
+        from utils.sharding import time_pattern_partials
+        
+        metric = request.args.get('metric', 'throughput')
+        with stage('data_fetch'):
+            df = get_dataset()
+        with stage('aggregate'):
+            partials = time_pattern_partials(df, metric)
+        return json_response(partials)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
+
+
+@app.route('/api/shard/location-stats', methods=['GET'])
+@conditional('dataset')
+def get_shard_location_stats():
+    """Per-locality daily statistics, from which the shard router ranks location demand."""
+    try:
+        from utils.sharding import location_statistics_partials
+        
+        with stage('data_fetch'):
+            df = get_dataset()
+        with stage('aggregate'):
+            partials = location_statistics_partials(df)
+        return json_response(partials)
+    except Exception as e:
+        return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
+
+
 # Feature 1: Signal Strength Prediction
 @app.route('/api/predict/signal-strength', methods=['POST'])
 def predict_signal_strength():
@@ -180,15 +320,30 @@ def predict_signal_strength():
         locality = data.get('locality')
         network_type = data.get('network_type', '4G')
         hours_ahead = int(data.get('hours_ahead', 24))
+        max_points = int(data['max_points']) if data.get('max_points') is not None else None
+        downsample = data.get('downsample', 'lttb')
         
         if not locality:
             return jsonify({'error': 'locality is required', 'code': 'MISSING_LOCALITY'}), 400
         
+        record_component_load('signal_predictor', signal_predictor)
         if not models_loaded:
             initialize_models()
         
-        result = signal_predictor.predict(locality, network_type, hours_ahead)
-        return jsonify(result)
+        from utils.harmonic_forecaster import select_engine
+        
+        with stage('model_predict'):
+            harmonic = get_harmonic_forecaster() if select_engine(locality, network_type) == 'harmonic' else None
+            # Keys too short for the harmonic model keep the Prophet predictor
+            if harmonic is not None and harmonic.is_determined(locality, network_type):
+                result = harmonic.predict_response(locality, network_type, hours_ahead)
+            else:
+                result = signal_predictor.predict(locality, network_type, hours_ahead)
+        with stage('downsample'):
+            from utils.downsampling import downsample_forecast
+            downsample_forecast(result, 'predicted_signal_strength', max_points, downsample)
+        with stage('serialize'):
+            return json_response(result)
     
     except ValueError as e:
         return jsonify({'error': str(e), 'code': 'PREDICTION_ERROR'}), 400
@@ -198,42 +353,62 @@ def predict_signal_strength():
 
 # Feature 2: Network Usage Analysis
 @app.route('/api/analysis/network-usage', methods=['GET'])
+@conditional('dataset')
 def analyze_network_usage():
     """Analyze network type usage."""
     try:
         locality = request.args.get('locality')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        resolution = request.args.get('resolution')
+        max_points = request.args.get('max_points', type=int)
         
-        df = data_loader.get_data()
+        with stage('data_fetch'):
+            df = get_dataset()
+        df = filter_rows(df, locality=locality)
         
         # Parse dates
         start_dt = datetime.fromisoformat(start_date) if start_date else None
         end_dt = datetime.fromisoformat(end_date) if end_date else None
         
-        result = network_analyzer.analyze(df, locality=locality, 
-                                         start_date=start_dt, end_date=end_dt)
-        return jsonify(result)
+        record_component_load('network_analyzer', network_analyzer)
+        with stage('aggregate'):
+            result = network_analyzer.analyze(df, locality=locality, 
+                                             start_date=start_dt, end_date=end_dt)
+        with stage('downsample'):
+            from utils.downsampling import resample_trends
+            if 'trends' in result:
+                result['trends'] = resample_trends(result['trends'], resolution, max_points)
+        with stage('serialize'):
+            return json_response(result)
     
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 400
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
 
 
 # Feature 3: Time Patterns
 @app.route('/api/analysis/time-patterns', methods=['GET'])
+@conditional('dataset')
 def analyze_time_patterns():
     """Analyze time-based demand patterns."""
     try:
         locality = request.args.get('locality')
         metric = request.args.get('metric', 'throughput')
         
-        df = data_loader.get_data()
+        with stage('data_fetch'):
+            df = get_dataset()
+        df = filter_rows(df, locality=locality)
         
-        result = time_analyzer.analyze(df, locality=locality, metric=metric)
-        heatmap_data = time_analyzer.get_heatmap_data(df, locality=locality, metric=metric)
-        result.update(heatmap_data)
+        record_component_load('time_analyzer', time_analyzer)
+        with stage('aggregate'):
+            result = time_analyzer.analyze(df, locality=locality, metric=metric)
+            heatmap_data = time_analyzer.get_heatmap_data(df, locality=locality, metric=metric)
+            result.update(heatmap_data)
         
-        return jsonify(result)
+        with stage('serialize'):
+            return json_response(result)
     
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
@@ -241,16 +416,21 @@ def analyze_time_patterns():
 
 # Feature 4: Location Demand
 @app.route('/api/analysis/location-demand', methods=['GET'])
+@conditional('dataset')
 def analyze_location_demand():
     """Analyze location-based demand."""
     try:
         metric = request.args.get('metric', 'composite')
         time_range = request.args.get('time_range', 'current')
         
-        df = data_loader.get_data()
+        with stage('data_fetch'):
+            df = get_dataset()
         
-        result = location_mapper.analyze(df, metric=metric, time_range=time_range)
-        return jsonify(result)
+        record_component_load('location_mapper', location_mapper)
+        with stage('aggregate'):
+            result = location_mapper.analyze(df, metric=metric, time_range=time_range)
+        with stage('serialize'):
+            return json_response(result)
     
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
@@ -265,16 +445,26 @@ def predict_throughput():
         locality = data.get('locality')
         network_type = data.get('network_type', '4G')
         hours_ahead = int(data.get('hours_ahead', 24))
+        max_points = int(data['max_points']) if data.get('max_points') is not None else None
+        downsample = data.get('downsample', 'lttb')
         
         if not locality:
             return jsonify({'error': 'locality is required', 'code': 'MISSING_LOCALITY'}), 400
         
+        record_component_load('throughput_forecaster', throughput_forecaster)
         if not models_loaded:
             initialize_models()
         
-        df = data_loader.get_data()
-        result = throughput_forecaster.predict(locality, network_type, df, hours_ahead)
-        return jsonify(result)
+        with stage('data_fetch'):
+            df = get_dataset()
+        df = filter_rows(df, locality=locality)
+        with stage('model_predict'):
+            result = throughput_forecaster.predict(locality, network_type, df, hours_ahead)
+        with stage('downsample'):
+            from utils.downsampling import downsample_forecast
+            downsample_forecast(result, 'predicted_throughput_mbps', max_points, downsample)
+        with stage('serialize'):
+            return json_response(result)
     
     except ValueError as e:
         return jsonify({'error': str(e), 'code': 'PREDICTION_ERROR'}), 400
@@ -282,6 +472,59 @@ def predict_throughput():
         return jsonify({'error': str(e), 'code': 'PREDICTION_ERROR'}), 500
 
 
+# Streaming degradation alerts
+@app.route('/api/stream/measurements', methods=['POST'])
+def ingest_measurements():
+    """Feed live measurements to the degradation detector."""
+    try:
+        data = request.get_json()
+        measurements = data.get('measurements', data) if isinstance(data, dict) else data
+        if not measurements:
+            return jsonify({'error': 'measurements are required', 'code': 'MISSING_MEASUREMENTS'}), 400
+        
+        with stage('aggregate'):
+            alerts = degradation_detector.ingest(measurements)
+        return json_response({
+            'accepted': len(measurements) if isinstance(measurements, list)
+                        else len(next(iter(measurements.values()), [])),
+            'alerts': alerts,
+            'last_seq': degradation_detector.last_seq,
+        })
+    
+    except ValueError as e:
+        return jsonify({'error': str(e), 'code': 'INGEST_ERROR'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e), 'code': 'INGEST_ERROR'}), 500
+
+
+@app.route('/api/stream/alerts', methods=['GET'])
+def get_degradation_alerts():
+    """Poll degradation alerts newer than ``since``."""
+    try:
+        since = request.args.get('since', 0, type=int)
+        limit = request.args.get('limit', type=int)
+        
+        alerts = degradation_detector.alerts_since(since, limit)
+        return json_response({
+            'alerts': alerts,
+            **degradation_detector.summary(),
+        })
+    except Exception as e:
+        return jsonify({'error': str(e), 'code': 'ALERTS_ERROR'}), 500
+
+
+@app.route('/api/stream/alerts/events', methods=['GET'])
+def stream_degradation_alerts():
+    """Server-sent events stream of degradation alerts."""
+    # Reconnecting EventSource clients resume from the last event they saw
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', 0, type=int)
+    return Response(stream_with_context(degradation_detector.stream(since)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 # Model management endpoints
 @app.route('/api/models/retrain', methods=['POST'])
 def retrain_models():
@@ -304,6 +547,7 @@ def retrain_models():
 
 
 @app.route('/api/models/metrics', methods=['GET'])
+@conditional('models')
 def get_model_metrics():
     """Get current model performance metrics."""
     try:
@@ -319,7 +563,7 @@ def get_model_metrics():
         for key, model_data in throughput_forecaster.models.items():
             metrics['throughput'][key] = model_data.get('metrics', {})
         
-        return jsonify(metrics)
+        return json_response(metrics)
     except Exception as e:
         return jsonify({'error': str(e), 'code': 'METRICS_ERROR'}), 500
 
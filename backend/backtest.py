@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Walk-forward backtest of the forecasting models."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import MODELS_DIR
+from utils.backtesting import DEFAULT_HORIZONS, FORECASTERS, WalkForwardBacktester
+from utils.preprocessing import DataPreprocessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of a forecaster")
+    parser.add_argument('--model', choices=sorted(FORECASTERS), default='throughput')
+    parser.add_argument('--folds', type=int, default=8)
+    parser.add_argument('--horizons', type=float, nargs='+', default=list(DEFAULT_HORIZONS),
+                        help="Lead-time buckets in hours")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--dataset', type=Path, default=None,
+                        help="CSV file or directory (default: download from Kaggle)")
+    parser.add_argument('--partitions', type=Path, default=None,
+                        help="Partition directory written by preprocess_chunked")
+    parser.add_argument('--output', type=Path, default=None)
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor()
+    if args.partitions:
+        df = preprocessor.load_partitions(args.partitions)
+    else:
+        df = preprocessor.preprocess(preprocessor.load_dataset(args.dataset))
+
+    fit_predict, target = FORECASTERS[args.model]
+    backtester = WalkForwardBacktester(fit_predict, target, horizons=args.horizons, n_jobs=args.jobs)
+    summary = backtester.run(df, n_folds=args.folds)
+
+    print("\nAccuracy by horizon:")
+    print(backtester.accuracy_by_horizon(summary).to_string(index=False))
+
+    output = args.output or MODELS_DIR / "backtests" / f"{args.model}.json"
+    backtester.save(summary, output, args.model)
+
+
+if __name__ == '__main__':
+    main()
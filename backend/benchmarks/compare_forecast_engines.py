@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Accuracy and cost comparison of the harmonic engine against Prophet.
+
+Fits both engines on the same temporal training split, scores them per
+(locality, network_type) on the holdout, and writes a report plus the
+per-key engine selection used by ``utils.harmonic_forecaster.select_engine``.
+A key uses the harmonic engine unless Prophet's RMSE is better by more than
+``--tolerance``.
+
+Usage:
+    python benchmarks/compare_forecast_engines.py --dataset path/to/data.csv
+    python benchmarks/compare_forecast_engines.py --synthetic-rows 200000
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+
+from config import MODELS_DIR
+from utils.harmonic_forecaster import ENGINE_SELECTION_PATH, KEY_COLUMNS, HarmonicForecaster
+from utils.model_utils import get_grouped_regression_metrics
+from utils.preprocessing import DataPreprocessor
+from utils.synthetic_data import generate_cellular_dataset
+
+TARGET = 'Signal_Strength'
+
+
+def prophet_holdout(train_df, test_df):
+    """Fit one Prophet model per key and predict the holdout rows."""
+    from prophet import Prophet
+    import logging
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    predictions = {}
+    train_groups = dict(tuple(train_df.groupby(KEY_COLUMNS, observed=True)))
+    for key, rows in test_df.groupby(KEY_COLUMNS, observed=True):
+        history = train_groups.get(key)
+        if history is None or len(history) < 2:
+            continue
+        model = Prophet(daily_seasonality=True, weekly_seasonality=True, yearly_seasonality=False)
+        model.fit(history.rename(columns={'Timestamp': 'ds', TARGET: 'y'})[['ds', 'y']])
+        forecast = model.predict(rows[['Timestamp']].rename(columns={'Timestamp': 'ds'}))
+        predictions[tuple(str(v) for v in key)] = (rows[TARGET].to_numpy(), forecast['yhat'].to_numpy())
+    return predictions
+
+
+def harmonic_holdout(train_df, test_df):
+    forecaster = HarmonicForecaster().fit(train_df, TARGET)
+    test_df = test_df.assign(_yhat=forecaster.predict_rows(test_df))
+    return {tuple(str(v) for v in key): (rows[TARGET].to_numpy(), rows['_yhat'].to_numpy())
+            for key, rows in test_df.groupby(KEY_COLUMNS, observed=True)
+            if not np.isnan(rows['_yhat']).any()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare harmonic and Prophet forecast engines")
+    parser.add_argument('--dataset', type=Path, default=None, help="CSV file or directory")
+    parser.add_argument('--synthetic-rows', type=int, default=None,
+                        help="Use a synthetic dataset of this many rows instead")
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help="Relative RMSE advantage Prophet needs to be selected")
+    parser.add_argument('--output', type=Path, default=MODELS_DIR / "forecast_engine_comparison.json")
+    args = parser.parse_args()
+
+    preprocessor = DataPreprocessor()
+    raw = (generate_cellular_dataset(args.synthetic_rows) if args.synthetic_rows
+           else preprocessor.load_dataset(args.dataset))
+    df = preprocessor.preprocess(raw)
+    train_df, test_df = preprocessor.train_test_split(df)
+
+    engines = {}
+    start = time.perf_counter()
+    engines['harmonic'] = harmonic_holdout(train_df, test_df)
+    seconds = {'harmonic': time.perf_counter() - start}
+
+    try:
+        start = time.perf_counter()
+        engines['prophet'] = prophet_holdout(train_df, test_df)
+        seconds['prophet'] = time.perf_counter() - start
+    except ImportError as e:
+        print(f"Prophet unavailable ({e}); reporting the harmonic engine only")
+
+    metrics = {name: get_grouped_regression_metrics(results) for name, results in engines.items()}
+    keys = sorted(set().union(*(m.keys() for m in metrics.values())))
+
+    per_key, selection = {}, {}
+    for key in keys:
+        label = f"{key[0]}|{key[1]}"
+        entry = {name: metrics[name][key] for name in metrics if key in metrics[name]}
+        harmonic_rmse = entry.get('harmonic', {}).get('rmse', np.inf)
+        prophet_rmse = entry.get('prophet', {}).get('rmse', np.inf)
+        chosen = 'prophet' if prophet_rmse * (1 + args.tolerance) < harmonic_rmse else 'harmonic'
+        entry['selected'] = selection[label] = chosen
+        per_key[label] = entry
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'target': TARGET,
+        'train_rows': len(train_df),
+        'test_rows': len(test_df),
+        'fit_predict_seconds': seconds,
+        'tolerance': args.tolerance,
+        'selected_counts': {name: list(selection.values()).count(name) for name in ('harmonic', 'prophet')},
+        'keys': per_key,
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if 'prophet' in engines:
+        with open(ENGINE_SELECTION_PATH, 'w') as f:
+            json.dump(selection, f, indent=2)
+        print(f"Per-key engine selection written to {ENGINE_SELECTION_PATH}")
+
+    for name, secs in seconds.items():
+        rmse = np.mean([m['rmse'] for m in metrics[name].values()])
+        print(f"{name:>9}: {secs:8.2f}s fit+predict, mean per-key RMSE {rmse:.3f}")
+    print(f"Selected: {report['selected_counts']}")
+    print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark for the streaming degradation detector.
+
+Replays synthetic measurements in batches, with a throughput drop injected
+for one key halfway through, and reports measurements per second and the
+alerts raised.
+
+Usage:
+    python benchmarks/degradation_detector.py
+    python benchmarks/degradation_detector.py --rows 1000000 --batch 50000
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from utils.degradation import DegradationDetector
+from utils.preprocessing import DataPreprocessor
+from utils.synthetic_data import generate_cellular_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Degradation detector throughput")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--batch', type=int, default=10_000)
+    args = parser.parse_args()
+
+    df = DataPreprocessor().preprocess(generate_cellular_dataset(args.rows))
+    df = df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    df['Locality'] = df['Locality'].astype(str)
+    df['Network_Type'] = df['Network_Type'].astype(str)
+
+    first = df.iloc[0]
+    degraded = ((df['Locality'] == first['Locality']) & (df['Network_Type'] == first['Network_Type'])
+                & (df.index >= len(df) // 2))
+    df.loc[degraded, 'Data_Throughput'] *= 0.3
+
+    detector = DegradationDetector()
+    start = time.perf_counter()
+    for offset in range(0, len(df), args.batch):
+        detector.ingest(df.iloc[offset:offset + args.batch])
+    elapsed = time.perf_counter() - start
+
+    summary = detector.summary()
+    print(f"{summary['measurements']} measurements over {summary['keys']} keys in {elapsed:.2f}s "
+          f"({summary['measurements'] / elapsed:,.0f}/s)")
+    counts = Counter((a['type'], a['metric']) for a in detector.alerts_since(0))
+    for (kind, metric), count in sorted(counts.items()):
+        print(f"  {kind:<13} {metric:<16} {count}")
+    injected = [a for a in detector.alerts_since(0)
+                if a['type'] == 'change_point' and a['metric'] == 'Data_Throughput'
+                and (a['locality'], a['network_type']) == (first['Locality'], first['Network_Type'])]
+    print(f"Injected drop detected: {bool(injected)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Latency benchmark for the compiled forest engine.
+
+Trains random forests on synthetic data and compares single-row and batch
+latency of scikit-learn, ``CompiledForest`` and its memory-mapped reload.
+Equivalence with scikit-learn is covered by ``tests/test_forest_inference.py``.
+
+Usage:
+    python benchmarks/forest_inference.py
+    python benchmarks/forest_inference.py --trees 200 --rows 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from utils.forest_inference import CompiledForest
+from utils.preprocessing import DataPreprocessor
+from utils.synthetic_data import generate_cellular_dataset
+
+FEATURES = ['hour_of_day', 'day_of_week', 'is_weekend', 'time_of_day_encoded',
+            'Signal_Strength', 'Latency', 'Latitude', 'Longitude']
+
+
+def per_call_us(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def check(name: str, model, X: np.ndarray, repeat: int):
+    # Serving processes predict one request at a time without a worker pool
+    model.set_params(n_jobs=None)
+    compiled = CompiledForest.from_sklearn(model)
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled.save(name, Path(tmp))
+        mapped = CompiledForest.load(name, Path(tmp), mmap=True)
+
+        row = X[:1]
+        print(f"\n{name}: {compiled.meta['n_trees']} trees, max depth {compiled.max_depth}, "
+              f"{len(compiled.nodes)} nodes")
+        print(f"  single row   sklearn {per_call_us(lambda: model.predict(row), repeat):9.1f}us   "
+              f"compiled {per_call_us(lambda: compiled.predict(row), repeat):9.1f}us   "
+              f"mmap {per_call_us(lambda: mapped.predict(row), repeat):9.1f}us")
+        batch = X[:10_000]
+        print(f"  10k rows     sklearn {per_call_us(lambda: model.predict(batch), 3) / 1000:9.1f}ms   "
+              f"compiled {per_call_us(lambda: compiled.predict(batch), 3) / 1000:9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled forest equivalence and latency")
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    df = DataPreprocessor().preprocess(generate_cellular_dataset(args.rows))
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    y = df['Data_Throughput'].to_numpy()
+    # Leave a few gaps so missing-value routing is exercised too
+    X_missing = X.copy()
+    X_missing[::97, 4] = np.nan
+
+    regressor = RandomForestRegressor(n_estimators=args.trees, max_depth=args.max_depth,
+                                      n_jobs=-1, random_state=0).fit(X, y)
+    check("throughput_regressor", regressor, X, args.repeat)
+
+    labels = np.digitize(y, [5.0, 20.0])
+    classifier = RandomForestClassifier(n_estimators=args.trees, max_depth=args.max_depth,
+                                        n_jobs=-1, random_state=0).fit(X_missing, labels)
+    check("fault_classifier", classifier, X_missing, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Import-time report and cold-start regression check for the backend.
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter, lists
+the slowest imports, and fails if heavy libraries are imported eagerly or if
+importing the app (or serving ``/api/health`` from a cold process) exceeds
+its budget.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --top 30 --json benchmarks/results/import_time.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Libraries that must not be imported until a request needs them
+HEAVY_MODULES = ['pandas', 'numpy', 'scipy', 'sklearn', 'prophet', 'cmdstanpy', 'kagglehub']
+
+# Budgets (milliseconds)
+IMPORT_BUDGET_MS = 300
+HEALTH_BUDGET_MS = 500
+
+HEALTH_SCRIPT = """
+import time
+start = time.perf_counter()
+import app
+client = app.app.test_client()
+response = client.get('/api/health')
+assert response.status_code == 200, response.status_code
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into ``(module, self_us, cumulative_us)`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_python(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, FAST_START='true')
+    return subprocess.run([sys.executable] + args, cwd=BACKEND_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def import_report() -> Dict:
+    """Import the app under ``-X importtime`` and summarize the result."""
+    # Warm the bytecode cache so the report measures imports, not compilation
+    run_python(['-c', 'import app'])
+    result = run_python(['-X', 'importtime', '-c', 'import app'])
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app failed:\n{result.stderr[-2000:]}")
+
+    rows = parse_importtime(result.stderr)
+    total_us = next(cumulative for module, _, cumulative in rows if module == 'app')
+    imported = {module for module, _, _ in rows}
+    heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+
+    return {
+        'total_ms': total_us / 1000,
+        'modules': len(rows),
+        'heavy_modules_imported': heavy,
+        'slowest': sorted(((module, cumulative / 1000) for module, _, cumulative in rows),
+                          key=lambda item: item[1], reverse=True),
+    }
+
+
+def health_latency_ms() -> float:
+    """Time from interpreter start to a served ``/api/health`` response."""
+    start = time.perf_counter()
+    result = run_python(['-c', HEALTH_SCRIPT])
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Health check failed:\n{result.stderr[-2000:]}")
+    return wall_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend import-time report")
+    parser.add_argument('--top', type=int, default=20, help="Number of slowest imports to list")
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--health-budget-ms', type=float, default=HEALTH_BUDGET_MS)
+    parser.add_argument('--json', type=Path, default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = import_report()
+    report['health_ms'] = health_latency_ms()
+
+    print(f"Importing app: {report['total_ms']:.1f}ms across {report['modules']} modules")
+    print(f"Process start to /api/health response: {report['health_ms']:.1f}ms")
+    print("\nSlowest imports (cumulative):")
+    for module, ms in report['slowest'][:args.top]:
+        print(f"  {ms:8.1f}ms  {module}")
+
+    failures = []
+    if report['heavy_modules_imported']:
+        failures.append(f"heavy modules imported eagerly: {', '.join(report['heavy_modules_imported'])}")
+    if report['total_ms'] > args.import_budget_ms:
+        failures.append(f"import took {report['total_ms']:.0f}ms (budget {args.import_budget_ms:.0f}ms)")
+    if report['health_ms'] > args.health_budget_ms:
+        failures.append(f"/api/health took {report['health_ms']:.0f}ms (budget {args.health_budget_ms:.0f}ms)")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        report['slowest'] = report['slowest'][:args.top]
+        report['failures'] = failures
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == '__main__':
+    main()
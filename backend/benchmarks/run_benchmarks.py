@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the network optimizer backend.
+
+Generates synthetic cellular datasets and times preprocessing, every ``/api/*``
+endpoint through the Flask test client, and training/prediction for both model
+families. Results are written as JSON under ``benchmarks/results`` so that runs
+from different versions can be compared with ``--compare``.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10k 1m
+    python benchmarks/run_benchmarks.py --sizes 10m --skip-endpoints --skip-models
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Keep benchmark artifacts out of the real model store
+os.environ.setdefault("MODELS_DIR", tempfile.mkdtemp(prefix="bench-models-"))
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="bench-data-"))
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+import pandas as pd
+
+from config import MODEL_VERSION, NETWORK_TYPES
+from utils.preprocessing import DataPreprocessor
+from utils.synthetic_data import generate_cellular_dataset, parse_row_count
+
+
+# Relative slowdown reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 3, warmup: int = 0) -> Dict[str, float]:
+    """Time ``fn`` and return summary statistics in seconds."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeat": repeat,
+    }
+
+
+def skipped(reason: str) -> Dict[str, str]:
+    """Result entry for a benchmark that could not run."""
+    return {"skipped": reason}
+
+
+class SyntheticDataLoader:
+    """Serves a preprocessed in-memory frame through the ``DataLoader`` interface."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def load_data(self) -> pd.DataFrame:
+        return self.df
+
+    def get_data(self) -> pd.DataFrame:
+        return self.df
+
+    def get_localities(self) -> List[str]:
+        return sorted(self.df['Locality'].astype(str).unique().tolist())
+
+    def get_network_types(self) -> List[str]:
+        return sorted(self.df['Network_Type'].astype(str).unique().tolist())
+
+    def get_locality_data(self, locality: str) -> pd.DataFrame:
+        return self.df[self.df['Locality'] == locality]
+
+    def release(self):
+        # Stands in for app.data_loader (a LazyComponent); the frame is reused on retrain
+        pass
+
+
+def bench_preprocessing(raw: pd.DataFrame, repeat: int) -> Dict[str, Any]:
+    """Time ``DataPreprocessor`` stages on the raw synthetic frame."""
+    preprocessor = DataPreprocessor()
+    processed = preprocessor.preprocess(raw)
+
+    return {
+        "preprocess": time_call(lambda: preprocessor.preprocess(raw), repeat, warmup=1),
+        "train_test_split": time_call(lambda: preprocessor.train_test_split(processed), repeat, warmup=1),
+        "normalize_features": time_call(
+            lambda: preprocessor.normalize_features(
+                processed[['Signal_Strength', 'Data_Throughput', 'Latency']].copy(),
+                ['Signal_Strength', 'Data_Throughput', 'Latency']),
+            repeat, warmup=1),
+    }
+
+
+def bench_metrics(df: pd.DataFrame, repeat: int) -> Dict[str, Any]:
+    """Time per-key evaluation: one call per key versus the grouped kernel."""
+    from utils.model_utils import (calculate_mae, calculate_mape, calculate_r2, calculate_rmse,
+                                   get_grouped_regression_metrics)
+
+    # Naive last-value forecast per (locality, network_type) as the prediction
+    keyed = df[['Locality', 'Network_Type', 'Data_Throughput']].copy()
+    keyed['prediction'] = keyed.groupby(['Locality', 'Network_Type'], observed=True)[
+        'Data_Throughput'].shift().fillna(keyed['Data_Throughput'])
+    results = {key: (group['Data_Throughput'].to_numpy(), group['prediction'].to_numpy())
+               for key, group in keyed.groupby(['Locality', 'Network_Type'], observed=True)}
+
+    def per_key():
+        return {key: {"rmse": calculate_rmse(y, p), "mae": calculate_mae(y, p),
+                      "mape": calculate_mape(y, p), "r2": calculate_r2(y, p)}
+                for key, (y, p) in results.items()}
+
+    return {
+        "keys": len(results),
+        "sklearn_per_key": time_call(per_key, repeat, warmup=1),
+        "grouped_kernel": time_call(lambda: get_grouped_regression_metrics(results), repeat, warmup=1),
+    }
+
+
+def bench_models(df: pd.DataFrame, model_rows: int, repeat: int) -> Dict[str, Any]:
+    """Time training and prediction for both model families."""
+    results: Dict[str, Any] = {}
+    train_df = df.tail(model_rows)
+    locality = str(train_df['Locality'].iloc[-1])
+    network_type = str(train_df['Network_Type'].iloc[-1])
+
+    try:
+        from models.signal_strength_predictor import SignalStrengthPredictor
+    except ImportError as e:
+        results['signal_strength'] = skipped(f"import failed: {e}")
+    else:
+        predictor = SignalStrengthPredictor()
+        results['signal_strength'] = {
+            "train": time_call(lambda: predictor.train(train_df), repeat=1),
+            "predict_24h": time_call(
+                lambda: predictor.predict(locality, network_type, 24), repeat, warmup=1),
+        }
+
+    try:
+        from models.throughput_forecaster import ThroughputForecaster
+    except ImportError as e:
+        results['throughput'] = skipped(f"import failed: {e}")
+    else:
+        forecaster = ThroughputForecaster()
+        results['throughput'] = {
+            "train": time_call(lambda: forecaster.train(train_df), repeat=1),
+            "predict_24h": time_call(
+                lambda: forecaster.predict(locality, network_type, train_df, 24), repeat, warmup=1),
+        }
+
+    return results
+
+
+def bench_endpoints(df: pd.DataFrame, repeat: int) -> Dict[str, Any]:
+    """Time every ``/api/*`` endpoint through the Flask test client."""
+    try:
+        import app as app_module
+    except Exception as e:
+        return {"all": skipped(f"app import failed: {e}")}
+
+    # Snapshots freeze the frame they publish, so give the app its own copy
+    app_module.data_loader = SyntheticDataLoader(df.copy())
+    app_module.dataset_store.publish(app_module.data_loader.get_data())
+    # Prediction endpoints train on demand when models are not loaded; the
+    # model benchmarks cover training, so only the request path is timed here.
+    app_module.models_loaded = True
+    client = app_module.app.test_client()
+
+    locality = str(df['Locality'].iloc[0])
+    network_type = str(df['Network_Type'].iloc[0]) if 'Network_Type' in df.columns else NETWORK_TYPES[0]
+    prediction_body = {"locality": locality, "network_type": network_type, "hours_ahead": 24}
+    measurement_cols = [col for col in ('Timestamp', 'Locality', 'Network_Type', 'Signal_Strength',
+                                        'Data_Throughput', 'Latency') if col in df.columns]
+    measurements = json.loads(df[measurement_cols].head(1000).to_json(orient='records', date_format='iso'))
+
+    def first_event(path: str):
+        """Open an SSE stream, read its first event and disconnect."""
+        response = client.get(path, buffered=False)
+        next(iter(response.response), None)
+        response.close()
+        return response
+
+    requests = {
+        "GET /api/health": lambda: client.get('/api/health'),
+        "GET /api/localities": lambda: client.get('/api/localities'),
+        "GET /api/network-types": lambda: client.get('/api/network-types'),
+        "GET /api/data/summary": lambda: client.get('/api/data/summary'),
+        "POST /api/predict/signal-strength": lambda: client.post(
+            '/api/predict/signal-strength', json=prediction_body),
+        "GET /api/analysis/network-usage": lambda: client.get('/api/analysis/network-usage'),
+        "GET /api/analysis/time-patterns": lambda: client.get(
+            '/api/analysis/time-patterns', query_string={"metric": "throughput"}),
+        "GET /api/analysis/location-demand": lambda: client.get(
+            '/api/analysis/location-demand', query_string={"metric": "composite"}),
+        "POST /api/predict/throughput": lambda: client.post(
+            '/api/predict/throughput', json=prediction_body),
+        "GET /api/models/metrics": lambda: client.get('/api/models/metrics'),
+        "POST /api/stream/measurements": lambda: client.post(
+            '/api/stream/measurements', json={"measurements": measurements}),
+        "GET /api/stream/alerts": lambda: client.get('/api/stream/alerts'),
+        # Time to the first event; alerts raised by the ingest above are replayed at once
+        "GET /api/stream/alerts/events": lambda: first_event('/api/stream/alerts/events?since=0'),
+        "GET /metrics": lambda: client.get('/metrics'),
+    }
+    # Retraining runs the whole training pipeline, so it is timed once and last
+    single_shot = {
+        "POST /api/models/retrain": lambda: client.post('/api/models/retrain'),
+    }
+
+    results: Dict[str, Any] = {}
+    for name, call in list(requests.items()) + list(single_shot.items()):
+        response = call()
+        if response.status_code != 200:
+            body = response.get_json(silent=True) or {}
+            results[name] = skipped(f"HTTP {response.status_code}: {body.get('error', '')}")
+            continue
+        stats = time_call(call, 1 if name in single_shot else repeat)
+        if not response.is_streamed:
+            stats["response_bytes"] = len(response.get_data())
+        results[name] = stats
+    app_module.models_loaded = True
+
+    return results
+
+
+def run_size(n_rows: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every benchmark section for one dataset size."""
+    print(f"\n=== {n_rows} rows ===")
+    result: Dict[str, Any] = {"rows": n_rows}
+
+    start = time.perf_counter()
+    raw = generate_cellular_dataset(n_rows, n_localities=args.localities, seed=args.seed)
+    result["generate_seconds"] = time.perf_counter() - start
+
+    print("Preprocessing...")
+    result["preprocessing"] = bench_preprocessing(raw, args.repeat)
+    df = DataPreprocessor().preprocess(raw)
+    del raw
+
+    print("Metrics...")
+    result["metrics"] = bench_metrics(df, args.repeat)
+
+    if not args.skip_endpoints:
+        print("Endpoints...")
+        result["endpoints"] = bench_endpoints(df, args.repeat)
+
+    if not args.skip_models:
+        print("Models...")
+        try:
+            result["models"] = bench_models(df, min(args.model_rows, n_rows), args.repeat)
+        except Exception as e:
+            traceback.print_exc()
+            result["models"] = skipped(f"{type(e).__name__}: {e}")
+
+    return result
+
+
+def git_revision() -> Optional[str]:
+    """Current git commit, if available."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten_timings(node: Any, prefix: str = "") -> Dict[str, float]:
+    """Flatten a results tree to ``{path: median seconds}``."""
+    flat: Dict[str, float] = {}
+    if isinstance(node, dict):
+        if "median" in node:
+            flat[prefix] = node["median"]
+        else:
+            for key, value in node.items():
+                flat.update(flatten_timings(value, f"{prefix}/{key}" if prefix else str(key)))
+    return flat
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Print a comparison table and return the regressed benchmark paths."""
+    old = flatten_timings(baseline.get("results", {}))
+    new = flatten_timings(current.get("results", {}))
+
+    print(f"\nComparison against {baseline.get('version')} ({baseline.get('git_commit')}):")
+    regressions = []
+    for path in sorted(set(old) & set(new)):
+        ratio = new[path] / old[path] if old[path] > 0 else float('inf')
+        flag = ""
+        if ratio > 1 + REGRESSION_THRESHOLD:
+            flag = "  <-- REGRESSION"
+            regressions.append(path)
+        print(f"  {path:<70} {old[path] * 1000:10.2f}ms -> {new[path] * 1000:10.2f}ms  x{ratio:.2f}{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run backend benchmarks on synthetic data")
+    parser.add_argument('--sizes', nargs='+', default=['10k', '1m'],
+                        help="Dataset sizes, e.g. 10k 1m 10m")
+    parser.add_argument('--localities', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--model-rows', type=int, default=100_000,
+                        help="Cap on the rows used for model training benchmarks")
+    parser.add_argument('--skip-endpoints', action='store_true')
+    parser.add_argument('--skip-models', action='store_true')
+    parser.add_argument('--output', type=Path, default=None,
+                        help="Results file (default: benchmarks/results/<version>-<time>.json)")
+    parser.add_argument('--compare', type=Path, default=None,
+                        help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "version": MODEL_VERSION,
+        "git_commit": git_revision(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "results": {},
+    }
+
+    for size in args.sizes:
+        n_rows = parse_row_count(size)
+        report["results"][size] = run_size(n_rows, args)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = RESULTS_DIR / f"{MODEL_VERSION}-{report['git_commit'] or 'nogit'}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_results(baseline, report):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
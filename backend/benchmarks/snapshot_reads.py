@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Concurrent read benchmark: defensive copies vs immutable dataset snapshots.
+
+Several threads serve analyzer-style requests (filter by locality, add a
+derived column, aggregate) while a publisher reloads the dataset in the
+background. Both modes copy the full frame on every reload. The "copy" mode
+also gives each request ``df.copy()`` of the shared frame; the "snapshot"
+mode gives it a read-only view from ``SnapshotStore``.
+Reports request latency percentiles and peak traced memory for each mode.
+
+Usage:
+    python benchmarks/snapshot_reads.py
+    python benchmarks/snapshot_reads.py --rows 2000000 --threads 16
+"""
+
+import argparse
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+
+from utils.preprocessing import DataPreprocessor
+from utils.snapshots import SnapshotStore
+from utils.synthetic_data import generate_cellular_dataset
+
+
+def serve(df, locality: str) -> float:
+    subset = df[df['Locality'] == locality]
+    subset['Latency_Score'] = subset['Latency'] / subset['Latency'].max()
+    return float(subset['Latency_Score'].mean())
+
+
+def run(mode: str, base, threads: int, requests: int, reload_every: float):
+    store = SnapshotStore()
+    # Published frames become read-only, so keep ``base`` writable for the copies
+    store.publish(base.copy())
+    shared = {'df': base.copy()}
+    localities = base['Locality'].astype(str).unique().tolist()
+
+    if mode == 'copy':
+        lock = threading.Lock()
+
+        def get_data():
+            with lock:
+                return shared['df'].copy()
+
+        def reload():
+            with lock:
+                shared['df'] = base.copy()
+    else:
+        get_data = store.get_data
+
+        def reload():
+            # A reload builds a new frame, like the copy mode's reload; publish keeps it without copying
+            store.publish(base.copy())
+
+    stop = threading.Event()
+
+    def publisher():
+        while not stop.wait(reload_every):
+            reload()
+
+    def request(i: int) -> float:
+        start = time.perf_counter()
+        serve(get_data(), localities[i % len(localities)])
+        return time.perf_counter() - start
+
+    tracemalloc.start()
+    reloader = threading.Thread(target=publisher, daemon=True)
+    reloader.start()
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = np.array(list(pool.map(request, range(requests)))) * 1000
+    stop.set()
+    reloader.join()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{mode:>8}: p50 {np.percentile(latencies, 50):7.2f}ms   p99 {np.percentile(latencies, 99):7.2f}ms   "
+          f"peak traced memory {peak / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent dataset reads: copies vs snapshots")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--reload-every', type=float, default=0.2, help="Seconds between reloads")
+    args = parser.parse_args()
+
+    base = DataPreprocessor().preprocess(generate_cellular_dataset(args.rows))
+    print(f"{len(base)} rows, {args.threads} threads, {args.requests} requests")
+    for mode in ('copy', 'snapshot'):
+        run(mode, base, args.threads, args.requests, args.reload_every)
+
+
+if __name__ == '__main__':
+    main()
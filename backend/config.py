@@ -7,12 +7,12 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent
 
 # Data directory
-DATA_DIR = BASE_DIR / "data"
-DATA_DIR.mkdir(exist_ok=True)
+DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR / "data")))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Models directory
-MODELS_DIR = BASE_DIR / "models"
-MODELS_DIR.mkdir(exist_ok=True)
+MODELS_DIR = Path(os.getenv("MODELS_DIR", str(BASE_DIR / "models")))
+MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Dataset configuration
 DATASET_NAME = "suraj520/cellular-network-analysis-dataset"
@@ -54,3 +54,47 @@ NETWORK_TYPES = ["3G", "4G", "5G", "LTE"]
 # Time intervals
 TIME_INTERVAL_MINUTES = 10
 
+# Instrumentation: requests slower than this many milliseconds get a sampling
+# profile written to PROFILES_DIR (0 disables the profiler)
+PROFILE_SLOW_REQUESTS_MS = float(os.getenv("PROFILE_SLOW_REQUESTS_MS", "0"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILES_DIR = Path(os.getenv("PROFILES_DIR", str(DATA_DIR / "profiles")))
+
+# Chunked preprocessing for datasets larger than RAM
+PREPROCESS_CHUNK_ROWS = int(os.getenv("PREPROCESS_CHUNK_ROWS", "250000"))
+PREPROCESS_MEMORY_LIMIT_MB = float(os.getenv("PREPROCESS_MEMORY_LIMIT_MB", "2048"))
+PARTITIONS_DIR = Path(os.getenv("PARTITIONS_DIR", str(DATA_DIR / "partitions")))
+
+# Fast start: skip background training at startup and load heavy libraries
+# (pandas, scikit-learn, Prophet) only when the first request needs them
+FAST_START = os.getenv("FAST_START", "False").lower() == "true"
+
+# Signal strength forecasting engine: "prophet" or "harmonic" (vectorized
+# Fourier regression); per-key choices from the engine comparison override it.
+# Read through utils.harmonic_forecaster.select_engine by /api/predict/signal-strength
+SIGNAL_FORECAST_ENGINE = os.getenv("SIGNAL_FORECAST_ENGINE", "prophet")
+
+# Response layer: JSON bodies at least this large are gzip/brotli compressed
+# when the client accepts it (0 disables compression)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
+# Streaming degradation detector: EWMA smoothing factor, one-sided CUSUM
+# allowance/decision threshold (in standard deviations), consecutive
+# measurements a breach or CUSUM rise must last before it is reported,
+# measurements per key before change points are reported, and alerts kept
+# for polling
+DEGRADATION_EWMA_ALPHA = float(os.getenv("DEGRADATION_EWMA_ALPHA", "0.02"))
+DEGRADATION_CUSUM_K = float(os.getenv("DEGRADATION_CUSUM_K", "0.5"))
+DEGRADATION_CUSUM_H = float(os.getenv("DEGRADATION_CUSUM_H", "16.0"))
+DEGRADATION_MIN_RUN = int(os.getenv("DEGRADATION_MIN_RUN", "5"))
+DEGRADATION_WARMUP = int(os.getenv("DEGRADATION_WARMUP", "50"))
+DEGRADATION_ALERT_BUFFER = int(os.getenv("DEGRADATION_ALERT_BUFFER", "10000"))
+
+# Sharded mode: each worker owns the localities with crc32(name) % SHARD_COUNT
+# == SHARD_INDEX. The router reaches workers at SHARD_URLS, or by default on
+# consecutive ports from SHARD_BASE_PORT on localhost
+SHARD_INDEX = int(os.getenv("SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+SHARD_URLS = [url.strip() for url in os.getenv("SHARD_URLS", "").split(",") if url.strip()]
+SHARD_BASE_PORT = int(os.getenv("SHARD_BASE_PORT", str(API_PORT + 1)))
+SHARD_TIMEOUT_SECONDS = float(os.getenv("SHARD_TIMEOUT_SECONDS", "300"))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Train the network-fault severity classifier on the sparse feature store.
+
+Script version of the fault notebook: instead of merging each table with
+``drop_duplicates(subset=['id'])`` and refitting label encoders on test
+data, features come from ``FaultFeatureStore`` with a vocabulary fitted on
+train and saved alongside the model.
+
+Usage:
+    python predictionmodel/train_fault_model.py --input predictionmodel/input
+"""
+
+import argparse
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from config import DATA_DIR, MODELS_DIR
+from utils.fault_features import FaultFeatureStore, load_fault_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the fault severity classifier")
+    parser.add_argument('--input', type=Path, default=Path(__file__).parent / "input")
+    parser.add_argument('--trees', type=int, default=100)
+    # Written next to the generated data; predictiondata/sub.csv keeps the notebook's tracked output
+    parser.add_argument('--submission', type=Path, default=DATA_DIR / "fault_submission.csv")
+    args = parser.parse_args()
+
+    tables = load_fault_tables(args.input)
+    train = pd.read_csv(args.input / "train.csv")
+    test = pd.read_csv(args.input / "test.csv")
+
+    store = FaultFeatureStore().fit(tables, train['location'])
+    X_train = store.transform(train)
+    print(f"Feature matrix: {X_train.shape[0]} rows x {X_train.shape[1]} columns, {X_train.nnz} non-zeros")
+
+    model = RandomForestClassifier(n_estimators=args.trees, n_jobs=-1, random_state=42)
+    model.fit(X_train, train['fault_severity'])
+
+    model_path = MODELS_DIR / "fault_model.pkl"
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    store.save()
+    print(f"Fault model saved to {model_path}")
+
+    proba = model.predict_proba(store.transform(test))
+    submission = pd.DataFrame(proba, columns=[f"predict_{c}" for c in model.classes_])
+    submission.insert(0, 'id', test['id'].to_numpy())
+    # Same number format as the notebook's submission
+    args.submission.parent.mkdir(parents=True, exist_ok=True)
+    submission.to_csv(args.submission, index=False, header=True, float_format='%.2f')
+    print(f"Submission written to {args.submission}")
+
+
+if __name__ == '__main__':
+    main()
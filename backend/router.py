@@ -0,0 +1,405 @@
+"""Scatter-gather router in front of locality-sharded backend workers."""
+
+import json
+import queue
+import sys
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask_cors import CORS
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import CORS_ORIGINS, API_HOST, API_PORT, SHARD_COUNT, SHARD_URLS, SHARD_BASE_PORT, SHARD_TIMEOUT_SECONDS
+from utils import instrumentation, responses
+from utils.instrumentation import stage
+from utils.downsampling import resample_trends
+from utils.lazy import LazyComponent
+from utils.responses import json_response
+from utils.sharding import (
+    shard_for, merge_localities, merge_network_types, merge_summary_partials,
+    merge_network_usage, merge_model_metrics, merge_time_pattern_partials, location_demand,
+)
+
+app = Flask(__name__)
+CORS(app, origins=CORS_ORIGINS)
+instrumentation.init_app(app)
+responses.init_app(app)
+
+# Runs the peak-hour and demand-cluster logic on merged time-pattern partials
+time_analyzer = LazyComponent('models.time_pattern_analyzer', 'TimePatternAnalyzer')
+
+SHARDS: List[str] = []
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def set_shards(urls: List[str]):
+    """Point the router at worker base URLs, one per shard index."""
+    global SHARDS, _pool
+    SHARDS = list(urls)
+    _pool = ThreadPoolExecutor(max_workers=4 * len(SHARDS), thread_name_prefix='shard-call')
+
+
+set_shards(SHARD_URLS or [f"http://127.0.0.1:{SHARD_BASE_PORT + i}" for i in range(SHARD_COUNT)])
+
+# Request headers passed through to workers
+FORWARDED_HEADERS = ('Content-Type', 'If-None-Match', 'Last-Event-ID')
+
+
+class ShardError(Exception):
+    """A worker was unreachable or answered a scatter request with an error."""
+
+    def __init__(self, message: str, status: int = 502):
+        super().__init__(message)
+        self.status = status
+
+
+def call_shard(shard: int, path: str, method: str = 'GET', query: str = '',
+               body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any, bytes]:
+    """
+    Send one HTTP request to a worker.
+
+    Returns:
+        Tuple of (status, headers, body); HTTP error statuses are returned, not raised
+    """
+    url = SHARDS[shard] + path + (f"?{query}" if query else '')
+    # The router re-encodes merged payloads, so ask workers for plain bodies
+    req = urllib.request.Request(url, data=body, method=method,
+                                 headers={'Accept-Encoding': 'identity', **(headers or {})})
+    try:
+        with urllib.request.urlopen(req, timeout=SHARD_TIMEOUT_SECONDS) as resp:
+            return resp.status, resp.headers, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+    except (urllib.error.URLError, OSError) as e:
+        raise ShardError(f"Shard {shard} ({SHARDS[shard]}) is unavailable: {getattr(e, 'reason', e)}")
+
+
+def forward(shard: int) -> Response:
+    """Proxy the current request to ``shard`` unchanged."""
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    with stage('shard_call'):
+        status, resp_headers, body = call_shard(shard, request.path, request.method,
+                                                request.query_string.decode(), request.get_data() or None, headers)
+    response = Response(body, status=status, content_type=resp_headers.get('Content-Type', 'application/json'))
+    for name in ('ETag', 'Cache-Control'):
+        if name in resp_headers:
+            response.headers[name] = resp_headers[name]
+    return response
+
+
+def scatter(path: str, method: str = 'GET', query: str = '', bodies: Optional[List[Optional[bytes]]] = None,
+            shards: Optional[List[int]] = None) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Send a request to several workers in parallel and decode their JSON answers.
+
+    Returns:
+        List of (shard, payload) in shard order
+
+    Raises:
+        ShardError: If any worker is unreachable or answers with an error
+    """
+    shards = list(range(len(SHARDS))) if shards is None else shards
+    headers = {'Content-Type': 'application/json'} if bodies else {}
+    with stage('shard_call'):
+        futures = [_pool.submit(call_shard, shard, path, method, query,
+                                bodies[i] if bodies else None, headers)
+                   for i, shard in enumerate(shards)]
+        answers = [future.result() for future in futures]
+
+    results = []
+    for shard, (status, _, body) in zip(shards, answers):
+        payload = json.loads(body) if body else {}
+        if status != 200:
+            error = payload.get('error', body.decode(errors='replace')) if isinstance(payload, dict) else body
+            raise ShardError(f"Shard {shard} failed: {error}", status if 400 <= status < 500 else 502)
+        results.append((shard, payload))
+    return results
+
+
+def gather(path: str, drop: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Scatter the current GET request to every worker and return the payloads.
+
+    Args:
+        path: Worker path to call
+        drop: Query parameters not to pass on, for those the router applies itself
+    """
+    query = urllib.parse.urlencode([(key, value) for key, value in request.args.items(multi=True)
+                                    if key not in drop])
+    return [payload for _, payload in scatter(path, query=query)]
+
+
+def parse_cursor(value: Optional[str]) -> List[int]:
+    """Per-shard sequence numbers from a comma-separated cursor, padded with zeros."""
+    cursor = [int(seq) for seq in (value or '').split(',') if seq.strip()]
+    return (cursor + [0] * len(SHARDS))[:len(SHARDS)]
+
+
+def owner_of(locality: str) -> int:
+    return shard_for(locality, len(SHARDS))
+
+
+@app.errorhandler(ShardError)
+def handle_shard_error(e: ShardError):
+    return jsonify({'error': str(e), 'code': 'SHARD_ERROR'}), e.status
+
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health of the router and every worker."""
+    shards = []
+    for shard in range(len(SHARDS)):
+        try:
+            status, _, body = call_shard(shard, '/api/health')
+            payload = json.loads(body) if status == 200 else {}
+            shards.append({'index': shard, 'url': SHARDS[shard], 'status': payload.get('status', 'unhealthy'),
+                           'models_loaded': payload.get('models_loaded', False)})
+        except ShardError:
+            shards.append({'index': shard, 'url': SHARDS[shard], 'status': 'unreachable', 'models_loaded': False})
+    healthy = all(s['status'] == 'healthy' for s in shards)
+    return jsonify({
+        'status': 'healthy' if healthy else 'degraded',
+        'models_loaded': all(s['models_loaded'] for s in shards),
+        'timestamp': datetime.now().isoformat(),
+        'shards': shards,
+    })
+
+
+@app.route('/api/localities', methods=['GET'])
+def get_localities():
+    return json_response(merge_localities(gather('/api/localities')))
+
+
+@app.route('/api/network-types', methods=['GET'])
+def get_network_types():
+    return json_response(merge_network_types(gather('/api/network-types')))
+
+
+@app.route('/api/data/summary', methods=['GET'])
+def get_data_summary():
+    """Dataset statistics merged exactly from per-shard partial aggregates."""
+    partials = gather('/api/shard/summary')
+    with stage('aggregate'):
+        summary = merge_summary_partials(partials)
+    return json_response(summary)
+
+
+@app.route('/api/shard/summary', methods=['GET'])
+def get_shard_summary():
+    """Partial statistics of one worker (``shard`` query parameter) or a list of all of them."""
+    shard = request.args.get('shard', type=int)
+    if shard is None:
+        return json_response(gather('/api/shard/summary'))
+    if not 0 <= shard < len(SHARDS):
+        return jsonify({'error': f'shard must be between 0 and {len(SHARDS) - 1}', 'code': 'INVALID_SHARD'}), 400
+    return forward(shard)
+
+
+@app.route('/api/analysis/network-usage', methods=['GET'])
+def analyze_network_usage():
+    locality = request.args.get('locality')
+    if locality:
+        return forward(owner_of(locality))
+    # Workers would bin trends over their own date spans, so merge full
+    # resolution and resample the combined series once
+    results = gather('/api/analysis/network-usage', drop=('resolution', 'max_points'))
+    with stage('aggregate'):
+        merged = merge_network_usage(results)
+    if 'trends' in merged:
+        with stage('downsample'):
+            try:
+                merged['trends'] = resample_trends(merged['trends'], request.args.get('resolution'),
+                                                   request.args.get('max_points', type=int))
+            except ValueError as e:
+                return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 400
+    return json_response(merged)
+
+
+@app.route('/api/analysis/time-patterns', methods=['GET'])
+def analyze_time_patterns():
+    locality = request.args.get('locality')
+    if locality:
+        return forward(owner_of(locality))
+    # All localities: exact averages from per hour-and-day sums and counts,
+    # peak hours and demand clusters from the analyzer on an equivalent frame
+    metric = request.args.get('metric', 'throughput')
+    partials = gather('/api/shard/time-patterns')
+    with stage('aggregate'):
+        try:
+            merged = merge_time_pattern_partials(partials, metric, time_analyzer)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 400
+        except Exception as e:
+            return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 500
+    return json_response(merged)
+
+
+@app.route('/api/analysis/location-demand', methods=['GET'])
+def analyze_location_demand():
+    """Rank every locality by demand from per-shard statistics, scored once here."""
+    partials = gather('/api/shard/location-stats', drop=('metric', 'time_range'))
+    with stage('aggregate'):
+        try:
+            merged = location_demand(partials, request.args.get('metric', 'composite'),
+                                     request.args.get('time_range', 'current'))
+        except ValueError as e:
+            return jsonify({'error': str(e), 'code': 'ANALYSIS_ERROR'}), 400
+    return json_response(merged)
+
+
+@app.route('/api/predict/signal-strength', methods=['POST'])
+@app.route('/api/predict/throughput', methods=['POST'])
+def predict():
+    """Route a single-locality prediction to the worker owning the locality."""
+    data = request.get_json(silent=True) or {}
+    if not data.get('locality'):
+        return jsonify({'error': 'locality is required', 'code': 'MISSING_LOCALITY'}), 400
+    return forward(owner_of(data['locality']))
+
+
+@app.route('/api/models/retrain', methods=['POST'])
+def retrain_models():
+    """Retrain on every worker (each trains only its own localities)."""
+    results = scatter('/api/models/retrain', method='POST')
+    return jsonify({
+        'status': 'success',
+        'message': 'Models retraining initiated',
+        'models_loaded': all(payload.get('models_loaded', False) for _, payload in results),
+    })
+
+
+@app.route('/api/models/metrics', methods=['GET'])
+def get_model_metrics():
+    return json_response(merge_model_metrics(gather('/api/models/metrics')))
+
+
+@app.route('/api/stream/measurements', methods=['POST'])
+def ingest_measurements():
+    """Split a measurement batch by owning shard and ingest the parts in parallel."""
+    data = request.get_json(silent=True)
+    measurements = data.get('measurements', data) if isinstance(data, dict) else data
+    if not measurements:
+        return jsonify({'error': 'measurements are required', 'code': 'MISSING_MEASUREMENTS'}), 400
+
+    if isinstance(measurements, dict):
+        # Columnar batch: split every column by the owner of each row's locality
+        owners = [owner_of(loc) for loc in measurements.get('Locality', [])]
+        parts = {shard: {col: [v for v, o in zip(values, owners) if o == shard]
+                         for col, values in measurements.items()}
+                 for shard in set(owners)}
+    else:
+        parts = {}
+        for record in measurements:
+            parts.setdefault(owner_of(record.get('Locality', '')), []).append(record)
+
+    shards = sorted(parts)
+    results = scatter('/api/stream/measurements', method='POST', shards=shards,
+                      bodies=[json.dumps(parts[shard]).encode('utf-8') for shard in shards])
+    return json_response({
+        'accepted': sum(payload['accepted'] for _, payload in results),
+        'alerts': [{**alert, 'shard': shard} for shard, payload in results for alert in payload['alerts']],
+    })
+
+
+@app.route('/api/stream/alerts', methods=['GET'])
+def get_degradation_alerts():
+    """
+    Poll alerts from every worker.
+
+    Each worker numbers its own alerts, so the cursor is a comma-separated
+    list of per-shard sequence numbers, returned as ``cursor`` for the next poll.
+    """
+    cursor = parse_cursor(request.args.get('since'))
+    limit = request.args.get('limit')
+    futures = [_pool.submit(call_shard, shard, '/api/stream/alerts',
+                            query=f"since={cursor[shard]}" + (f"&limit={limit}" if limit else ''))
+               for shard in range(len(SHARDS))]
+
+    alerts, last_seqs = [], []
+    for shard, future in enumerate(futures):
+        status, _, body = future.result()
+        if status != 200:
+            raise ShardError(f"Shard {shard} failed: {body.decode(errors='replace')}")
+        payload = json.loads(body)
+        shard_alerts = payload['alerts']
+        alerts.extend({**alert, 'shard': shard} for alert in shard_alerts)
+        last_seqs.append(shard_alerts[-1]['seq'] if shard_alerts else max(cursor[shard], 0))
+    alerts.sort(key=lambda alert: alert['detected_at'])
+    return json_response({'alerts': alerts, 'cursor': ','.join(str(seq) for seq in last_seqs)})
+
+
+
+def read_events(shard: int, since: int, events: queue.Queue, stop: threading.Event):
+    """
+    Relay one worker's alert event stream into ``events`` until ``stop`` is set.
+
+    Reconnects after a dropped connection, resuming from the last alert seen.
+    """
+    while not stop.is_set():
+        req = urllib.request.Request(f"{SHARDS[shard]}/api/stream/alerts/events",
+                                     headers={'Last-Event-ID': str(since), 'Accept': 'text/event-stream'})
+        try:
+            # The read timeout only has to outlast the worker's keep-alive comments
+            with urllib.request.urlopen(req, timeout=max(SHARD_TIMEOUT_SECONDS, 30)) as resp:
+                data = []
+                for raw in resp:
+                    if stop.is_set():
+                        return
+                    line = raw.decode('utf-8').rstrip('\r\n')
+                    if line.startswith('data:'):
+                        data.append(line[5:].lstrip())
+                    elif not line and data:
+                        alert = json.loads('\n'.join(data))
+                        since = alert['seq']
+                        events.put((shard, alert))
+                        data = []
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"Alert stream of shard {shard} dropped: {getattr(e, 'reason', e)}")
+        stop.wait(1.0)
+
+
+@app.route('/api/stream/alerts/events', methods=['GET'])
+def stream_degradation_alerts():
+    """
+    Server-sent events of every worker's alerts, interleaved as they arrive.
+
+    Event IDs are the comma-separated per-shard cursor, so a reconnecting
+    EventSource resumes each worker where it left off.
+    """
+    cursor = parse_cursor(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    events: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    for shard in range(len(SHARDS)):
+        threading.Thread(target=read_events, args=(shard, cursor[shard], events, stop),
+                         name=f'alert-stream-{shard}', daemon=True).start()
+
+    def generate():
+        try:
+            while True:
+                try:
+                    shard, alert = events.get(timeout=15.0)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                cursor[shard] = alert['seq']
+                event_id = ','.join(str(seq) for seq in cursor)
+                yield f"id: {event_id}\nevent: alert\ndata: {json.dumps({**alert, 'shard': shard})}\n\n"
+        finally:
+            stop.set()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+if __name__ == '__main__':
+    print(f"Starting shard router for {len(SHARDS)} workers: {', '.join(SHARDS)}")
+    app.run(host=API_HOST, port=API_PORT, debug=False, threaded=True)
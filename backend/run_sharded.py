@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Run the backend in sharded mode on one machine.
+
+Starts N worker processes (``run.py`` with ``SHARD_INDEX``/``SHARD_COUNT``),
+each owning the localities that hash to it and keeping its models under
+``MODELS_DIR/shard_<i>``, then serves the scatter-gather router on
+``API_PORT``.
+
+Usage:
+    python run_sharded.py --shards 4
+    python run_sharded.py --shards 8 --base-port 6001
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from config import API_PORT, MODELS_DIR
+
+
+def wait_until_healthy(urls, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    pending = set(urls)
+    while pending and time.monotonic() < deadline:
+        for url in list(pending):
+            try:
+                with urllib.request.urlopen(f"{url}/api/health", timeout=2) as resp:
+                    if json.loads(resp.read()).get('status') == 'healthy':
+                        pending.discard(url)
+            except OSError:
+                pass
+        time.sleep(0.5)
+    return not pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run sharded workers and the router")
+    parser.add_argument('--shards', type=int, default=int(os.getenv("SHARD_COUNT", "0")) or os.cpu_count() or 2)
+    parser.add_argument('--base-port', type=int, default=API_PORT + 1)
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    # Turn SIGTERM into SystemExit so the workers are stopped on the way out
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    urls = [f"http://127.0.0.1:{args.base_port + i}" for i in range(args.shards)]
+    workers = []
+    for i in range(args.shards):
+        env = dict(os.environ,
+                   SHARD_INDEX=str(i),
+                   SHARD_COUNT=str(args.shards),
+                   API_PORT=str(args.base_port + i),
+                   MODELS_DIR=str(MODELS_DIR / f"shard_{i}"))
+        workers.append(subprocess.Popen([sys.executable, str(BACKEND_DIR / "run.py")], env=env))
+    print(f"Started {args.shards} workers on ports {args.base_port}-{args.base_port + args.shards - 1}")
+
+    try:
+        if not wait_until_healthy(urls, args.startup_timeout):
+            print("Warning: not all workers answered /api/health; the router will report them as unreachable")
+
+        import router
+        router.set_shards(urls)
+        print(f"Router listening on port {API_PORT}")
+        router.app.run(host='0.0.0.0', port=API_PORT, debug=False, threaded=True)
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Streaming degradation detector: change points, thresholds and alert cursors."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import SIGNAL_STRENGTH_FAIR
+from utils.degradation import DegradationDetector
+
+
+def measurements(locality, throughput, signal=-75.0, latency=40.0, network_type='4G'):
+    n = len(throughput)
+    return pd.DataFrame({
+        'Timestamp': pd.date_range('2024-01-01', periods=n, freq='10min').astype(str),
+        'Locality': locality,
+        'Network_Type': network_type,
+        'Signal_Strength': np.broadcast_to(signal, n),
+        'Data_Throughput': throughput,
+        'Latency': np.broadcast_to(latency, n),
+    })
+
+
+def test_stationary_noise_stays_quiet():
+    rng = np.random.default_rng(0)
+    detector = DegradationDetector()
+    batch = pd.concat([
+        measurements(f'Loc{i}', rng.normal(30, 3, 3000),
+                     signal=rng.normal(-75, 4, 3000), latency=rng.normal(40, 5, 3000))
+        for i in range(10)
+    ], ignore_index=True)
+    assert detector.ingest(batch) == []
+    assert detector.summary()['measurements'] == len(batch)
+
+
+def test_detects_injected_drop():
+    rng = np.random.default_rng(1)
+    throughput = rng.normal(30, 2, 600)
+    throughput[400:] -= 15
+    detector = DegradationDetector()
+    alerts = detector.ingest(measurements('Loc0', throughput))
+
+    changes = [a for a in alerts if a['type'] == 'change_point']
+    assert changes and all(a['metric'] == 'Data_Throughput' for a in changes)
+    first = pd.Timestamp(changes[0]['timestamp'])
+    drop = pd.Timestamp('2024-01-01') + 400 * pd.Timedelta(minutes=10)
+    assert drop <= first <= drop + 10 * pd.Timedelta(minutes=10)
+    # The baseline is the pre-drop level, barely moved by the few points before the alert
+    assert changes[0]['baseline_mean'] > throughput[400:].mean() + 10
+
+
+def test_threshold_needs_a_sustained_breach():
+    detector = DegradationDetector(min_run=5)
+    # A single outlier and values flapping around the threshold stay quiet
+    signal = np.full(40, -80.0)
+    signal[5] = SIGNAL_STRENGTH_FAIR - 20
+    signal[10:20:2] = SIGNAL_STRENGTH_FAIR - 1
+    assert detector.ingest(measurements('Loc0', np.full(40, 30.0), signal=signal)) == []
+
+    # A sustained breach is reported once
+    alerts = detector.ingest(measurements('Loc0', np.full(20, 30.0), signal=np.full(20, SIGNAL_STRENGTH_FAIR - 5)))
+    assert [(a['type'], a['metric']) for a in alerts] == [('threshold', 'Signal_Strength')]
+    assert detector.get_state('Loc0', '4G')['Signal_Strength']['in_breach']
+
+
+def test_batch_equals_one_measurement_at_a_time():
+    rng = np.random.default_rng(2)
+    frames = []
+    for i in range(3):
+        throughput = rng.normal(30, 2, 300)
+        throughput[200 + 20 * i:] -= 12
+        frames.append(measurements(f'Loc{i}', throughput))
+    # Interleave the keys as a live stream would
+    stream = pd.concat(frames).sort_values('Timestamp', kind='stable').reset_index(drop=True)
+
+    batched = DegradationDetector().ingest(stream)
+    single = DegradationDetector()
+    one_by_one = [alert for i in range(len(stream)) for alert in single.ingest(stream.iloc[[i]])]
+    strip = lambda alerts: [{k: v for k, v in a.items() if k != 'detected_at'} for a in alerts]
+    assert batched and strip(batched) == strip(one_by_one)
+
+
+def test_alerts_since_and_restarted_cursor():
+    detector = DegradationDetector(min_run=1)
+    detector.ingest(measurements('Loc0', np.full(3, 1.0)))
+    detector.ingest(measurements('Loc1', np.full(3, 1.0)))
+    assert detector.last_seq == 2
+    assert [a['seq'] for a in detector.alerts_since(0)] == [1, 2]
+    assert [a['seq'] for a in detector.alerts_since(1)] == [2]
+    assert detector.alerts_since(2) == []
+    assert [a['seq'] for a in detector.alerts_since(0, limit=1)] == [1]
+    # A cursor from before a restart is ahead of the counter
+    assert [a['seq'] for a in detector.alerts_since(50)] == [1, 2]
+
+
+def test_rejects_measurements_without_keys():
+    with pytest.raises(ValueError):
+        DegradationDetector().ingest([{'Signal_Strength': -80.0}])
@@ -0,0 +1,99 @@
+"""Shape-preserving downsampling of forecasts and usage trends."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.downsampling import downsample_forecast, lttb_indices, minmax_indices, resample_trends
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(0)
+    y = np.sin(np.linspace(0, 12 * np.pi, 5000)) + rng.normal(0, 0.05, 5000)
+    y[1234] = 8.0
+    y[3210] = -8.0
+    return y
+
+
+@pytest.mark.parametrize('select', [lttb_indices, minmax_indices])
+def test_keeps_endpoints_and_spikes(series, select):
+    indices = select(series, 100)
+    assert len(indices) <= 100
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0 and indices[-1] == len(series) - 1
+    assert 1234 in indices and 3210 in indices
+
+
+def test_lttb_returns_exactly_n_points(series):
+    assert len(lttb_indices(series, 100)) == 100
+
+
+def test_minmax_keeps_every_bucket_extreme(series):
+    indices = set(minmax_indices(series, 100).tolist())
+    edges = np.linspace(1, len(series) - 1, (100 - 2) // 2 + 1).astype(np.int64)
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = series[start:end]
+        assert start + int(np.argmax(bucket)) in indices
+        assert start + int(np.argmin(bucket)) in indices
+
+
+@pytest.mark.parametrize('select', [lttb_indices, minmax_indices])
+def test_short_series_and_missing_values(select):
+    assert select(np.arange(10.0), 50).tolist() == list(range(10))
+    y = np.arange(200.0)
+    y[50:60] = np.nan
+    indices = select(y, 20)
+    assert not np.isnan(y[indices[1:-1]]).any()
+    with pytest.raises(ValueError):
+        select(np.arange(100.0), 2)
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_forecast_intervals_stay_aligned(series, method):
+    result = {
+        'predictions': [{'timestamp': i, 'predicted_signal_strength': v} for i, v in enumerate(series)],
+        'confidence_intervals': [{'timestamp': i, 'lower': v - 1, 'upper': v + 1} for i, v in enumerate(series)],
+    }
+    downsample_forecast(result, 'predicted_signal_strength', 100, method)
+    assert len(result['predictions']) <= 100
+    assert len(result['confidence_intervals']) == len(result['predictions'])
+    for point, band in zip(result['predictions'], result['confidence_intervals']):
+        assert point['timestamp'] == band['timestamp']
+        assert band['lower'] < point['predicted_signal_strength'] < band['upper']
+    assert result['downsampling'] == {'method': method, 'original_points': len(series),
+                                      'returned_points': len(result['predictions'])}
+
+
+def test_forecast_under_the_limit_is_unchanged():
+    result = {'predictions': [{'predicted_signal_strength': 1.0}] * 10}
+    assert downsample_forecast(result, 'predicted_signal_strength', 50) == {'predictions': result['predictions']}
+    with pytest.raises(ValueError):
+        downsample_forecast({'predictions': [{'v': 1.0}] * 10}, 'v', 5, 'median')
+
+
+def test_resampled_trends_share_bins_and_totals():
+    first = pd.date_range('2024-01-01', periods=24 * 40, freq='h')
+    second = pd.date_range('2024-01-20 07:30', periods=24 * 90, freq='h')
+    trends = [
+        {'network_type': '4G', 'dates': [d.isoformat() for d in first], 'counts': [1] * len(first)},
+        {'network_type': '5G', 'dates': [d.isoformat() for d in second], 'counts': [2] * len(second)},
+    ]
+    resampled = resample_trends(trends, max_points=50)
+    assert all(len(t['dates']) <= 50 for t in resampled)
+    assert [sum(t['counts']) for t in resampled] == [len(first), 2 * len(second)]
+    # Both trends are binned on the same edges
+    step = pd.to_datetime(resampled[0]['dates'][1]) - pd.to_datetime(resampled[0]['dates'][0])
+    origin = pd.to_datetime(resampled[0]['dates'][0])
+    assert all((pd.to_datetime(d) - origin) % step == pd.Timedelta(0) for d in resampled[1]['dates'])
+
+    daily = resample_trends(trends, resolution='1D')
+    assert daily[0]['dates'][:2] == ['2024-01-01', '2024-01-02']
+    with pytest.raises(ValueError):
+        resample_trends(trends, resolution='not-a-frequency')
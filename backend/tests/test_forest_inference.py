@@ -0,0 +1,87 @@
+"""Equivalence of the compiled forest engine with scikit-learn."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ensemble = pytest.importorskip("sklearn.ensemble")
+
+from utils.forest_inference import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 6))
+    y = 3 * X[:, 0] + np.sin(4 * X[:, 1]) + X[:, 2] * X[:, 3] + rng.normal(scale=0.3, size=len(X))
+    X_missing = X.copy()
+    X_missing[::7, 1] = np.nan
+    X_missing[::11, 4] = np.nan
+    return X, y, X_missing
+
+
+@pytest.fixture(scope="module")
+def regressor(data):
+    X, y, _ = data
+    return ensemble.RandomForestRegressor(n_estimators=20, max_depth=10, random_state=0).fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def classifier(data):
+    _, y, X_missing = data
+    labels = np.digitize(y, [-1.0, 1.0])
+    return ensemble.RandomForestClassifier(n_estimators=20, max_depth=10, random_state=0).fit(X_missing, labels)
+
+
+def engines(model, tmp_path):
+    """The compiled forest and its memory-mapped reload."""
+    compiled = CompiledForest.from_sklearn(model)
+    compiled.save("model", tmp_path)
+    return [compiled, CompiledForest.load("model", tmp_path, mmap=True)]
+
+
+def test_regressor_matches_sklearn(regressor, data, tmp_path):
+    X, _, _ = data
+    expected = regressor.predict(X)
+    for engine in engines(regressor, tmp_path):
+        np.testing.assert_allclose(engine.predict(X), expected, rtol=1e-12, atol=1e-12)
+
+
+def test_single_row_matches_batch(regressor, data):
+    X, _, _ = data
+    compiled = CompiledForest.from_sklearn(regressor)
+    batch = compiled.predict(X[:50])
+    rows = np.array([compiled.predict(X[i]) for i in range(50)]).ravel()
+    np.testing.assert_allclose(rows, batch, rtol=1e-12, atol=1e-12)
+
+
+def test_classifier_matches_sklearn_with_missing_values(classifier, data, tmp_path):
+    _, _, X_missing = data
+    expected_proba = classifier.predict_proba(X_missing)
+    expected = classifier.predict(X_missing)
+    for engine in engines(classifier, tmp_path):
+        np.testing.assert_allclose(engine.predict_proba(X_missing), expected_proba, rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(engine.predict(X_missing), expected)
+
+
+def test_load_is_memory_mapped(regressor, tmp_path):
+    CompiledForest.from_sklearn(regressor).save("model", tmp_path)
+    loaded = CompiledForest.load("model", tmp_path, mmap=True)
+    assert isinstance(loaded.nodes.base, np.memmap) or isinstance(loaded.nodes, np.memmap)
+
+
+def test_rejects_wrong_feature_count(regressor, data):
+    X, _, _ = data
+    with pytest.raises(ValueError):
+        CompiledForest.from_sklearn(regressor).predict(X[:, :3])
+
+
+def test_predict_proba_requires_classifier(regressor, data):
+    X, _, _ = data
+    with pytest.raises(ValueError):
+        CompiledForest.from_sklearn(regressor).predict_proba(X[:5])
@@ -0,0 +1,67 @@
+"""Harmonic forecaster fits and prediction intervals."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.harmonic_forecaster import HarmonicForecaster
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range('2024-01-01', periods=2000, freq='10min')
+    hours = timestamps.hour.to_numpy() + timestamps.minute.to_numpy() / 60
+    long_key = pd.DataFrame({
+        'Timestamp': timestamps,
+        'Locality': 'Long',
+        'Network_Type': '4G',
+        'Signal_Strength': -80 + 5 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 1, len(timestamps)),
+    })
+    # Fewer observations than the model's parameters
+    short_key = pd.DataFrame({
+        'Timestamp': timestamps[:5],
+        'Locality': 'Short',
+        'Network_Type': '4G',
+        'Signal_Strength': [-90.0, -91.0, -89.5, -90.5, -90.0],
+    })
+    return pd.concat([long_key, short_key], ignore_index=True)
+
+
+def test_recovers_daily_cycle(frame):
+    forecaster = HarmonicForecaster().fit(frame)
+    forecast = forecaster.predict('Long', '4G', hours_ahead=24)
+    hours = forecast['ds'].dt.hour + forecast['ds'].dt.minute / 60
+    expected = -80 + 5 * np.sin(2 * np.pi * hours / 24)
+    assert np.abs(forecast['yhat'] - expected).max() < 0.5
+    coverage = ((forecast['yhat_lower'] < expected) & (expected < forecast['yhat_upper'])).mean()
+    assert coverage == 1.0
+
+
+def test_underdetermined_key_uses_pooled_variance(frame):
+    forecaster = HarmonicForecaster().fit(frame)
+    assert forecaster.is_determined('Long', '4G')
+    assert not forecaster.is_determined('Short', '4G')
+    assert not forecaster.is_determined('Missing', '4G')
+
+    short = forecaster.predict('Short', '4G', hours_ahead=1)
+    long = forecaster.predict('Long', '4G', hours_ahead=1)
+    short_width = (short['yhat_upper'] - short['yhat_lower']).min()
+    long_width = (long['yhat_upper'] - long['yhat_lower']).min()
+    # About ±1.96 residual standard deviations of the long series, not zero
+    assert short_width >= long_width > 3.0
+
+
+def test_predict_response_matches_predictor_format(frame):
+    response = HarmonicForecaster().fit(frame).predict_response('Long', '4G', hours_ahead=2)
+    assert response['engine'] == 'harmonic'
+    assert len(response['predictions']) == 12
+    point = response['predictions'][0]
+    assert set(point) == {'timestamp', 'predicted_signal_strength', 'lower_bound', 'upper_bound'}
+    assert point['lower_bound'] < point['predicted_signal_strength'] < point['upper_bound']
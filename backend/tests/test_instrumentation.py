@@ -0,0 +1,85 @@
+"""Per-request instrumentation state and metrics."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+flask = pytest.importorskip("flask")
+
+from utils import instrumentation
+
+
+@pytest.fixture
+def profilers(monkeypatch):
+    created = []
+
+    class RecordingProfiler(instrumentation.SlowRequestProfiler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(instrumentation, "SlowRequestProfiler", RecordingProfiler)
+    return created
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, profilers):
+    monkeypatch.setattr(instrumentation, "PROFILES_DIR", tmp_path)
+    app = flask.Flask(__name__)
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+
+    @app.route('/ok')
+    def ok():
+        return 'ok'
+
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError("boom")
+
+    @app.route('/stream')
+    def stream():
+        def events():
+            yield "data: 1\n\n"
+            time.sleep(0.05)
+            yield "data: 2\n\n"
+        return flask.Response(flask.stream_with_context(events()), mimetype='text/event-stream')
+
+    instrumentation.init_app(app, profile_slow_requests_ms=10_000)
+    app.profiler = profilers[0]
+    return app
+
+
+def requests_total(route, status):
+    return instrumentation.registry.counter_value(
+        "http_requests_total", {"route": route, "method": "GET", "status": status})
+
+
+def test_unhandled_exception_does_not_leak_state(app):
+    before = requests_total('/boom', 500)
+    assert app.test_client().get('/boom').status_code == 500
+    assert requests_total('/boom', 500) == before + 1
+    assert getattr(instrumentation._request_state, "start", None) is None
+    assert getattr(instrumentation._request_state, "route", None) is None
+    assert app.profiler._active == {}
+
+
+def test_successful_request_is_recorded_once(app):
+    before = requests_total('/ok', 200)
+    assert app.test_client().get('/ok').status_code == 200
+    assert requests_total('/ok', 200) == before + 1
+    assert app.profiler._active == {}
+
+
+def test_stream_is_recorded_when_it_starts(app):
+    before = requests_total('/stream', 200)
+    response = app.test_client().get('/stream', buffered=False)
+    assert requests_total('/stream', 200) == before + 1
+    assert b"".join(response.response).count(b"data:") == 2
+    response.close()
+    assert requests_total('/stream', 200) == before + 1
+    assert app.profiler._active == {}
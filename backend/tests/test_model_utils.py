@@ -0,0 +1,91 @@
+"""Fused regression metrics and bootstrap intervals against scikit-learn."""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+metrics = pytest.importorskip("sklearn.metrics")
+
+from utils.model_utils import (bootstrap_metric_intervals, calculate_mape, get_grouped_regression_metrics,
+                               get_regression_metrics, grouped_regression_metrics)
+
+
+def sklearn_metrics(y_true, y_pred):
+    return {
+        "rmse": math.sqrt(metrics.mean_squared_error(y_true, y_pred)),
+        "mae": metrics.mean_absolute_error(y_true, y_pred),
+        "mape": calculate_mape(y_true, y_pred),
+        "r2": metrics.r2_score(y_true, y_pred),
+    }
+
+
+@pytest.fixture(scope="module")
+def sample():
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(-80, 8, 5000)
+    y_true[::50] = 0.0
+    return y_true, y_true + rng.normal(0, 3, len(y_true))
+
+
+def test_metrics_match_sklearn(sample):
+    y_true, y_pred = sample
+    result = get_regression_metrics(y_true, y_pred)
+    for name, expected in sklearn_metrics(y_true, y_pred).items():
+        assert result[name] == pytest.approx(expected, rel=1e-10), name
+
+
+def test_constant_target_matches_sklearn():
+    y_true = np.full(20, 5.0)
+    assert get_regression_metrics(y_true, y_true)["r2"] == metrics.r2_score(y_true, y_true)
+    assert get_regression_metrics(y_true, y_true + 1)["r2"] == metrics.r2_score(y_true, y_true + 1)
+
+
+def test_large_offset_is_numerically_stable():
+    rng = np.random.default_rng(1)
+    y_true = 1e9 + rng.normal(0, 1, 1000)
+    y_pred = y_true + rng.normal(0, 0.1, 1000)
+    assert get_regression_metrics(y_true, y_pred)["r2"] == pytest.approx(metrics.r2_score(y_true, y_pred), rel=1e-8)
+
+
+def test_grouped_metrics_match_per_key(sample):
+    y_true, y_pred = sample
+    results = {("Loc", str(i)): (y_true[i::7], y_pred[i::7]) for i in range(7)}
+    grouped = get_grouped_regression_metrics(results)
+    for key, (t, p) in results.items():
+        for name, expected in sklearn_metrics(t, p).items():
+            assert grouped[key][name] == pytest.approx(expected, rel=1e-10), (key, name)
+
+    ids = np.arange(len(y_true)) % 7
+    arrays = grouped_regression_metrics(y_true, y_pred, ids)
+    assert arrays["n"].sum() == len(y_true)
+
+
+def test_empty_input_raises():
+    with pytest.raises(ValueError):
+        get_regression_metrics(np.array([]), np.array([]))
+    with pytest.raises(ValueError):
+        get_grouped_regression_metrics({"a": ([1.0, 2.0], [1.0, 2.0]), "b": ([], [])})
+    with pytest.raises(ValueError):
+        get_regression_metrics(np.ones(3), np.ones(4))
+
+
+def test_bootstrap_matches_explicit_resampling(sample):
+    y_true, y_pred = sample[0][:300], sample[1][:300]
+    n, replicates = len(y_true), 200
+    intervals = bootstrap_metric_intervals(y_true, y_pred, n_bootstrap=replicates, seed=7)
+
+    # The same multinomial draws, applied by repeating rows
+    weights = np.random.default_rng(7).multinomial(n, np.full(n, 1.0 / n), size=replicates)
+    resampled = [sklearn_metrics(np.repeat(y_true, w), np.repeat(y_pred, w)) for w in weights]
+    for name, bounds in intervals.items():
+        values = [r[name] for r in resampled]
+        lower, upper = np.quantile(values, [0.025, 0.975])
+        assert bounds["lower"] == pytest.approx(lower, rel=1e-9), name
+        assert bounds["upper"] == pytest.approx(upper, rel=1e-9), name
+        assert bounds["lower"] <= get_regression_metrics(y_true, y_pred)[name] <= bounds["upper"]
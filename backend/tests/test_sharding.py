@@ -0,0 +1,153 @@
+"""Shard merges equal the same computation on the unsharded frame."""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DEMAND_WEIGHTS
+from utils import sharding
+
+SHARD_COUNT = 3
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    n = 6000
+    timestamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 60 * 24 * 3600, n)), unit='s')
+    localities = rng.choice([f'Loc{i}' for i in range(10)], n)
+    offset = np.array([int(name[3:]) for name in localities], dtype=float)
+    return pd.DataFrame({
+        'Timestamp': timestamps,
+        'Locality': localities,
+        'Latitude': 25 + offset / 10 + rng.normal(0, 0.01, n),
+        'Longitude': 85 + offset / 10 + rng.normal(0, 0.01, n),
+        'Signal_Strength': -80 + offset + rng.normal(0, 5, n),
+        'Data_Throughput': rng.gamma(2, 10, n) + offset,
+        'Latency': rng.normal(50, 10, n) - offset,
+        'Network_Type': rng.choice(['3G', '4G', '5G'], n),
+        'hour_of_day': timestamps.hour,
+        'day_of_week': timestamps.dayofweek,
+    })
+
+
+@pytest.fixture(scope="module")
+def shards(frame):
+    owner = frame['Locality'].map(lambda name: sharding.shard_for(name, SHARD_COUNT))
+    return [frame[owner == i] for i in range(SHARD_COUNT)]
+
+
+def roundtrip(payload):
+    """What the router receives: the worker's payload after JSON encoding."""
+    return json.loads(json.dumps(payload))
+
+
+class MeanAnalyzer:
+    """Stand-in for TimePatternAnalyzer whose output depends only on group means."""
+
+    def analyze(self, df, locality=None, metric='throughput'):
+        hourly = df.groupby('hour_of_day')[sharding.METRIC_COLUMNS[metric]].mean()
+        return {
+            'peak_hours': sorted(int(hour) for hour in hourly.nlargest(4).index),
+            'demand_clusters': {'0': {'count': int(len(df)), f'mean_{metric}': float(hourly.mean())}},
+        }
+
+
+def test_chan_merge_matches_pooled_statistics():
+    rng = np.random.default_rng(1)
+    a, b = rng.normal(3, 2, 50), rng.normal(-1, 5, 70)
+    triple = lambda x: [len(x), x.mean(), ((x - x.mean()) ** 2).sum()]
+    merged = sharding._chan_merge(triple(a), triple(b))
+    np.testing.assert_allclose(merged, triple(np.concatenate([a, b])))
+    assert sharding._chan_merge([0, 0.0, 0.0], [0, 0.0, 0.0]) == [0, 0.0, 0.0]
+
+
+def test_summary_merge_matches_single_frame(frame, shards):
+    merged = sharding.merge_summary_partials([roundtrip(sharding.summary_partials(df)) for df in shards])
+    assert merged['total_records'] == len(frame)
+    assert merged['localities'] == frame['Locality'].nunique()
+    assert merged['date_range']['start'] == frame['Timestamp'].min().isoformat()
+    for col in sharding.SUMMARY_COLUMNS:
+        stats = merged[col.lower()]
+        assert stats['mean'] == pytest.approx(frame[col].mean(), rel=1e-12)
+        assert stats['std'] == pytest.approx(frame[col].std(), rel=1e-12)
+        assert (stats['min'], stats['max']) == (frame[col].min(), frame[col].max())
+
+
+@pytest.mark.parametrize('metric', list(sharding.METRIC_COLUMNS))
+def test_time_pattern_merge_matches_single_frame(frame, shards, metric):
+    column = sharding.METRIC_COLUMNS[metric]
+    partials = [roundtrip(sharding.time_pattern_partials(df, metric)) for df in shards]
+    merged = sharding.merge_time_pattern_partials(partials, metric, MeanAnalyzer())
+
+    hourly = frame.groupby('hour_of_day')[column].mean()
+    daily = frame.groupby('day_of_week')[column].mean()
+    np.testing.assert_allclose([merged['hourly_averages'][hour] for hour in hourly.index], hourly, rtol=1e-12)
+    np.testing.assert_allclose([merged['daily_patterns'][day] for day in daily.index], daily, rtol=1e-12)
+    cells = frame.groupby(['hour_of_day', 'day_of_week'])[column].mean()
+    np.testing.assert_allclose([cell['value'] for cell in merged['heatmap']], cells, rtol=1e-12)
+
+    expected = MeanAnalyzer().analyze(frame, metric=metric)
+    assert merged['peak_hours'] == expected['peak_hours']
+    assert merged['demand_clusters']['0']['count'] == expected['demand_clusters']['0']['count']
+    assert merged['demand_clusters']['0'][f'mean_{metric}'] == pytest.approx(
+        expected['demand_clusters']['0'][f'mean_{metric}'], rel=1e-12)
+
+
+@pytest.mark.parametrize('metric', ['composite', 'throughput', 'signal_strength', 'latency'])
+@pytest.mark.parametrize('time_range', ['current', 'week', 'month'])
+def test_location_demand_sharded_equals_unsharded(frame, shards, metric, time_range):
+    unsharded = sharding.location_demand([roundtrip(sharding.location_statistics_partials(frame))],
+                                         metric, time_range)
+    sharded = sharding.location_demand([roundtrip(sharding.location_statistics_partials(df)) for df in shards],
+                                       metric, time_range)
+    assert [loc['name'] for loc in sharded['ranked_localities']] == \
+        [loc['name'] for loc in unsharded['ranked_localities']]
+    for got, expected in zip(sharded['ranked_localities'], unsharded['ranked_localities']):
+        assert got['demand_score'] == pytest.approx(expected['demand_score'], abs=1e-9)
+        for key, stats in expected['statistics'].items():
+            assert got['statistics'][key]['mean'] == pytest.approx(stats['mean'], rel=1e-12)
+            assert got['statistics'][key]['std'] == pytest.approx(stats['std'], rel=1e-9)
+    for key in ('mean', 'std', 'min', 'max', 'total_localities'):
+        assert sharded['statistics'][key] == pytest.approx(unsharded['statistics'][key], abs=1e-9)
+
+
+def test_location_demand_statistics_match_pandas(frame, shards):
+    result = sharding.location_demand([roundtrip(sharding.location_statistics_partials(df)) for df in shards],
+                                      'composite', 'week')
+    first_day = frame['Timestamp'].max().normalize() - pd.Timedelta(days=6)
+    expected = frame[frame['Timestamp'] >= first_day].groupby('Locality')['Data_Throughput'].agg(['mean', 'std'])
+    for loc in result['ranked_localities']:
+        assert loc['statistics']['throughput']['mean'] == pytest.approx(expected.loc[loc['name'], 'mean'])
+        assert loc['statistics']['throughput']['std'] == pytest.approx(expected.loc[loc['name'], 'std'])
+
+
+def test_composite_score_uses_demand_weights(frame):
+    partials = [sharding.location_statistics_partials(frame)]
+    composite = sharding.location_demand(partials, 'composite')
+    single = {metric: {loc['name']: loc['demand_score'] for loc in sharding.location_demand(partials, metric)
+                       ['ranked_localities']}
+              for metric in sharding.METRIC_COLUMNS}
+    for loc in composite['ranked_localities']:
+        expected = sum(weight * single[metric][loc['name']] for metric, weight in DEMAND_WEIGHTS.items())
+        assert loc['demand_score'] == pytest.approx(expected / sum(DEMAND_WEIGHTS.values()))
+
+
+def test_network_usage_merge_keeps_only_agreed_extra_keys(capsys):
+    results = [
+        {'usage_stats': {'4G': {'count': 3}}, 'trends': [], 'locality': None, 'period_days': 10},
+        {'usage_stats': {'4G': {'count': 1}, '5G': {'count': 4}}, 'trends': [], 'locality': None, 'period_days': 12},
+    ]
+    merged = sharding.merge_network_usage(results)
+    assert merged['usage_stats']['4G'] == {'count': 4, 'percentage': 50.0}
+    assert merged['dominant_network'] in ('4G', '5G')
+    assert merged['locality'] is None
+    assert 'period_days' not in merged
+    assert 'period_days' in capsys.readouterr().out
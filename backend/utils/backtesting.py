@@ -0,0 +1,325 @@
+"""Parallel walk-forward (rolling-origin) backtesting for the forecasters."""
+
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.harmonic_forecaster import harmonic_fit_predict
+from utils.model_utils import grouped_regression_metrics
+
+# Lead-time buckets (hours) reported by default
+DEFAULT_HORIZONS = (1, 3, 6, 12, 24, 48, 72)
+
+KEY_COLUMNS = ['Locality', 'Network_Type']
+
+# fit_predict(train_df, test_df) -> predictions aligned with test_df rows
+FitPredict = Callable[[pd.DataFrame, pd.DataFrame], np.ndarray]
+
+# Per-process state; inherited copy-on-write by forked workers
+_WORKER_STATE: Dict = {}
+
+
+def rolling_origin_cutoffs(timestamps: pd.Series, n_folds: int, horizon_hours: float,
+                           min_train_fraction: float = 0.5) -> List[pd.Timestamp]:
+    """
+    Evenly spaced forecast origins for walk-forward evaluation.
+
+    Args:
+        timestamps: Timestamps of the dataset
+        n_folds: Number of cutoffs
+        horizon_hours: Longest horizon evaluated after each cutoff
+        min_train_fraction: Fraction of the time span always used for training
+
+    Returns:
+        List of cutoff timestamps in increasing order
+    """
+    start, end = timestamps.min(), timestamps.max()
+    first = start + (end - start) * min_train_fraction
+    last = end - pd.Timedelta(hours=horizon_hours)
+    if last <= first:
+        raise ValueError("Dataset span is too short for the requested horizon and training window")
+    if n_folds == 1:
+        return [last]
+    step = (last - first) / (n_folds - 1)
+    return [first + step * i for i in range(n_folds)]
+
+
+class WalkForwardBacktester:
+    """
+    Evaluates a forecaster over many cutoffs and horizons in parallel.
+
+    The preprocessed frame is sorted once, and each fold's training and test
+    windows are positional slices of it. Workers are forked where the
+    platform allows it, so they share the parent's frame copy-on-write
+    instead of receiving a pickled copy per fold.
+    """
+
+    def __init__(self, fit_predict: FitPredict, target: str,
+                 horizons: Sequence[float] = DEFAULT_HORIZONS,
+                 n_jobs: Optional[int] = None):
+        """
+        Args:
+            fit_predict: Trains on the first frame and predicts ``target`` for
+                every row of the second; must be a module-level function
+            target: Column being forecast
+            horizons: Lead-time buckets (hours) to report metrics for
+            n_jobs: Worker processes (default: CPU count)
+        """
+        self.fit_predict = fit_predict
+        self.target = target
+        self.horizons = tuple(sorted(horizons))
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+
+    def run(self, df: pd.DataFrame, n_folds: int = 5,
+            cutoffs: Optional[Sequence[pd.Timestamp]] = None) -> pd.DataFrame:
+        """
+        Run the backtest.
+
+        Args:
+            df: Preprocessed dataframe
+            n_folds: Number of rolling origins (ignored if ``cutoffs`` is given)
+            cutoffs: Explicit forecast origins
+
+        Returns:
+            DataFrame of metrics per (Locality, Network_Type, horizon_hours),
+            pooled over all folds
+        """
+        frame = df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+        if cutoffs is None:
+            cutoffs = rolling_origin_cutoffs(frame['Timestamp'], n_folds, self.horizons[-1])
+
+        models_root = tempfile.mkdtemp(prefix='backtest-models-')
+        state = (frame, self.fit_predict, self.target, self.horizons, models_root)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        # Folds always run in workers so model files never touch this process's store
+        _set_worker_state(*state)
+        try:
+            # Forked workers already hold the state set above; spawned ones get it once
+            initargs = () if context.get_start_method() == 'fork' else state
+            with ProcessPoolExecutor(max_workers=max(1, min(self.n_jobs, len(cutoffs))),
+                                     mp_context=context, initializer=_init_worker,
+                                     initargs=initargs) as pool:
+                fold_results = list(pool.map(_run_fold, enumerate(cutoffs)))
+        finally:
+            _WORKER_STATE.clear()
+            shutil.rmtree(models_root, ignore_errors=True)
+
+        predictions = pd.concat([r for r in fold_results if len(r)], ignore_index=True) \
+            if any(len(r) for r in fold_results) else pd.DataFrame()
+        return self.summarize(predictions)
+
+    def summarize(self, predictions: pd.DataFrame) -> pd.DataFrame:
+        """Pool fold predictions into metrics per key and horizon bucket."""
+        columns = KEY_COLUMNS + ['horizon_hours', 'n', 'folds', 'rmse', 'mae', 'mape', 'r2', 'bias']
+        if predictions.empty:
+            return pd.DataFrame(columns=columns)
+
+        predictions = predictions.dropna(subset=['y_true', 'y_pred'])
+        groups = predictions.groupby(KEY_COLUMNS + ['horizon_hours'], observed=True, sort=True)
+        group_ids = groups.ngroup().to_numpy()
+        metrics = grouped_regression_metrics(predictions['y_true'].to_numpy(),
+                                             predictions['y_pred'].to_numpy(),
+                                             group_ids, groups.ngroups)
+
+        summary = groups.size().reset_index(name='n')
+        summary['folds'] = groups['fold'].nunique().to_numpy()
+        for name in ('rmse', 'mae', 'mape', 'r2'):
+            summary[name] = metrics[name]
+        # Mean signed error; positive when the model over-forecasts
+        errors = predictions['y_pred'].to_numpy() - predictions['y_true'].to_numpy()
+        summary['bias'] = np.bincount(group_ids, weights=errors, minlength=groups.ngroups) / summary['n'].to_numpy()
+        return summary[columns]
+
+    def accuracy_by_horizon(self, summary: pd.DataFrame) -> pd.DataFrame:
+        """
+        Metrics per horizon bucket over the pooled rows of all keys.
+
+        RMSE is pooled from the squared errors (``sqrt(sum(n * rmse**2) / sum(n))``);
+        MAE, MAPE and bias are means weighted by each key's row count.
+        """
+        n = summary['n']
+        weighted = summary.assign(sse=n * summary['rmse'] ** 2,
+                                  **{name: n * summary[name] for name in ('mae', 'mape', 'bias')})
+        curve = weighted.groupby('horizon_hours')[['n', 'sse', 'mae', 'mape', 'bias']].sum()
+        curve['rmse'] = np.sqrt(curve['sse'] / curve['n'])
+        for name in ('mae', 'mape', 'bias'):
+            curve[name] = curve[name] / curve['n']
+        return curve[['n', 'rmse', 'mae', 'mape', 'bias']].reset_index()
+
+    def save(self, summary: pd.DataFrame, path: Path, name: str) -> Path:
+        """
+        Store backtest results per key as JSON.
+
+        The file maps ``"<locality>|<network_type>"`` to a list of per-horizon
+        metrics, plus an overall accuracy-vs-horizon curve.
+        """
+        per_key: Dict[str, List[Dict]] = {}
+        for row in summary.to_dict('records'):
+            key = f"{row['Locality']}|{row['Network_Type']}"
+            per_key.setdefault(key, []).append({
+                'horizon_hours': float(row['horizon_hours']),
+                'n': int(row['n']),
+                'folds': int(row['folds']),
+                **{m: _json_float(row[m]) for m in ('rmse', 'mae', 'mape', 'r2', 'bias')},
+            })
+
+        curve = self.accuracy_by_horizon(summary) if len(summary) else pd.DataFrame()
+        report = {
+            'model': name,
+            'target': self.target,
+            'created_at': datetime.now().isoformat(),
+            'horizons': list(self.horizons),
+            'accuracy_by_horizon': [
+                {k: _json_float(v) for k, v in row.items()} for row in curve.to_dict('records')
+            ],
+            'keys': per_key,
+        }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Backtest results saved to {path}")
+        return path
+
+
+def _json_float(value) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _set_worker_state(frame, fit_predict, target, horizons, models_root):
+    _WORKER_STATE.update(frame=frame, fit_predict=fit_predict, target=target,
+                         horizons=np.asarray(horizons, dtype=np.float64),
+                         models_root=models_root)
+
+
+def _init_worker(*state):
+    if state:
+        _set_worker_state(*state)
+    _set_model_store(Path(_WORKER_STATE['models_root']) / str(os.getpid()))
+
+
+def _set_model_store(path: Path):
+    """Point MODELS_DIR at a private directory so concurrent folds never share model files."""
+    path.mkdir(parents=True, exist_ok=True)
+    os.environ['MODELS_DIR'] = str(path)
+    # Modules imported earlier bound MODELS_DIR at import time
+    for name, module in list(sys.modules.items()):
+        if (name == 'config' or name.startswith(('models.', 'utils.'))) \
+                and hasattr(module, 'MODELS_DIR'):
+            module.MODELS_DIR = path
+
+
+def _run_fold(task) -> pd.DataFrame:
+    fold, cutoff = task
+    frame = _WORKER_STATE['frame']
+    horizons = _WORKER_STATE['horizons']
+    target = _WORKER_STATE['target']
+
+    timestamps = frame['Timestamp'].to_numpy()
+    cutoff = np.datetime64(pd.Timestamp(cutoff).to_datetime64())
+    end = cutoff + np.timedelta64(int(horizons[-1] * 3600), 's')
+    train_end = int(np.searchsorted(timestamps, cutoff, side='right'))
+    test_end = int(np.searchsorted(timestamps, end, side='right'))
+
+    # Positional slices of the shared, time-sorted frame
+    train_df = frame.iloc[:train_end]
+    test_df = frame.iloc[train_end:test_end]
+    if train_df.empty or test_df.empty:
+        return pd.DataFrame()
+
+    y_pred = np.asarray(_WORKER_STATE['fit_predict'](train_df, test_df), dtype=np.float64)
+    lead_hours = (timestamps[train_end:test_end] - cutoff) / np.timedelta64(1, 'h')
+    bucket = horizons[np.minimum(np.searchsorted(horizons, lead_hours), len(horizons) - 1)]
+
+    result = test_df[KEY_COLUMNS].reset_index(drop=True)
+    result['fold'] = fold
+    result['horizon_hours'] = bucket
+    result['y_true'] = test_df[target].to_numpy(dtype=np.float64)
+    result['y_pred'] = y_pred
+    return result
+
+
+def _align_forecast(test_df: pd.DataFrame, forecast: pd.DataFrame, value_column: str) -> np.ndarray:
+    """Match forecast points to test rows by nearest timestamp."""
+    forecast = forecast[['timestamp', value_column]].copy()
+    forecast['timestamp'] = pd.to_datetime(forecast['timestamp']).astype(test_df['Timestamp'].dtype)
+    rows = test_df[['Timestamp']].reset_index(drop=True)
+    rows['_order'] = np.arange(len(rows))
+    merged = pd.merge_asof(rows.sort_values('Timestamp'), forecast.sort_values('timestamp'),
+                           left_on='Timestamp', right_on='timestamp', direction='nearest')
+    return merged.sort_values('_order')[value_column].to_numpy(dtype=np.float64)
+
+
+def _forecast_per_key(test_df: pd.DataFrame, predict_key: Callable, value_column: str) -> np.ndarray:
+    """Run ``predict_key(locality, network_type, hours_ahead)`` for every key in ``test_df``."""
+    y_pred = np.full(len(test_df), np.nan)
+    start = test_df['Timestamp'].min()
+    for (locality, network_type), rows in test_df.groupby(KEY_COLUMNS, observed=True):
+        hours_ahead = max(1, math.ceil((rows['Timestamp'].max() - start) / pd.Timedelta(hours=1)))
+        try:
+            result = predict_key(locality, network_type, hours_ahead)
+        except ValueError:
+            # No model for this key (e.g. too little training history)
+            continue
+        forecast = pd.DataFrame(result.get('predictions', []))
+        if forecast.empty:
+            continue
+        y_pred[test_df.index.get_indexer(rows.index)] = _align_forecast(rows, forecast, value_column)
+    return y_pred
+
+
+def signal_strength_fit_predict(train_df: pd.DataFrame, test_df: pd.DataFrame) -> np.ndarray:
+    """Backtest adapter for ``SignalStrengthPredictor``."""
+    from models.signal_strength_predictor import SignalStrengthPredictor
+
+    predictor = SignalStrengthPredictor()
+    predictor.train(train_df)
+    predictor.load_models()
+    return _forecast_per_key(test_df, predictor.predict, 'predicted_signal_strength')
+
+
+def throughput_fit_predict(train_df: pd.DataFrame, test_df: pd.DataFrame) -> np.ndarray:
+    """Backtest adapter for ``ThroughputForecaster``."""
+    from models.throughput_forecaster import ThroughputForecaster
+
+    forecaster = ThroughputForecaster()
+    forecaster.train(train_df)
+    forecaster.load_models()
+    return _forecast_per_key(
+        test_df,
+        lambda locality, network_type, hours: forecaster.predict(locality, network_type, train_df, hours),
+        'predicted_throughput_mbps')
+
+
+def seasonal_naive_fit_predict(train_df: pd.DataFrame, test_df: pd.DataFrame,
+                               target: str = 'Signal_Strength') -> np.ndarray:
+    """Baseline: mean of ``target`` per key and hour of day in the training window."""
+    profile = train_df.groupby(KEY_COLUMNS + ['hour_of_day'], observed=True)[target].mean()
+    keys = pd.MultiIndex.from_frame(test_df[KEY_COLUMNS + ['hour_of_day']])
+    return profile.reindex(keys).to_numpy(dtype=np.float64)
+
+
+# Forecasters available to the backtest CLI: name -> (fit_predict, target)
+FORECASTERS = {
+    'signal_strength': (signal_strength_fit_predict, 'Signal_Strength'),
+    'throughput': (throughput_fit_predict, 'Data_Throughput'),
+    'seasonal_naive': (seasonal_naive_fit_predict, 'Signal_Strength'),
+    'harmonic': (harmonic_fit_predict, 'Signal_Strength'),
+}
@@ -0,0 +1,285 @@
+"""Streaming signal-degradation detector over incoming measurements."""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import (
+    SIGNAL_STRENGTH_FAIR, THROUGHPUT_THRESHOLD,
+    DEGRADATION_EWMA_ALPHA, DEGRADATION_CUSUM_K, DEGRADATION_CUSUM_H,
+    DEGRADATION_MIN_RUN, DEGRADATION_WARMUP, DEGRADATION_ALERT_BUFFER,
+)
+
+METRICS = ('Signal_Strength', 'Data_Throughput', 'Latency')
+
+# Direction in which each metric degrades (+1: rises, -1: falls)
+DEGRADING_DIRECTION = np.array([-1.0, -1.0, 1.0])
+
+# Static floors per metric; NaN means no fixed threshold
+THRESHOLDS = np.array([SIGNAL_STRENGTH_FAIR, THROUGHPUT_THRESHOLD, np.nan])
+
+_MIN_STD = 1e-9
+
+
+class DegradationDetector:
+    """
+    Online per-(locality, network type) statistics with threshold and change-point alerts.
+
+    For every key and metric the detector keeps an exponentially weighted
+    mean and variance and a one-sided CUSUM of standardized residuals in the
+    degrading direction (signal and throughput falling, latency rising), so
+    each measurement costs O(1). State lives in NumPy arrays indexed by key;
+    a batch is processed in rounds where each round holds at most one
+    measurement per key, keeping per-key order while vectorizing across keys.
+
+    Alerts are raised when a key has breached ``SIGNAL_STRENGTH_FAIR`` or
+    ``THROUGHPUT_THRESHOLD`` for ``min_run`` consecutive measurements, and
+    when a CUSUM exceeds its decision threshold after the warm-up period
+    having risen for at least ``min_run`` consecutive measurements, so
+    single outliers and values flapping around a threshold stay quiet.
+    Alerts are numbered with an increasing ``seq`` and kept in a bounded
+    buffer for polling and SSE clients.
+    """
+
+    def __init__(self, alpha: float = DEGRADATION_EWMA_ALPHA, cusum_k: float = DEGRADATION_CUSUM_K,
+                 cusum_h: float = DEGRADATION_CUSUM_H, min_run: int = DEGRADATION_MIN_RUN,
+                 warmup: int = DEGRADATION_WARMUP, buffer_size: int = DEGRADATION_ALERT_BUFFER):
+        """
+        Args:
+            alpha: EWMA smoothing factor for the running mean and variance
+            cusum_k: CUSUM allowance, in standard deviations
+            cusum_h: CUSUM decision threshold, in standard deviations
+            min_run: Consecutive measurements a breach or CUSUM rise must
+                last before it is reported
+            warmup: Measurements per key before change points are reported
+            buffer_size: Number of most recent alerts kept for clients
+        """
+        self.alpha = alpha
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_run = max(1, min_run)
+        self.warmup = warmup
+
+        self.keys: List[Tuple[str, str]] = []
+        self.key_index: Dict[Tuple[str, str], int] = {}
+        self._allocate(64)
+
+        self.measurements = 0
+        self.last_seq = 0
+        self.alerts = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._new_alerts = threading.Condition()
+
+    def _allocate(self, capacity: int):
+        """Grow the per-key state arrays to ``capacity`` keys."""
+        n_metrics = len(METRICS)
+        old = getattr(self, 'mean', None)
+        size = 0 if old is None else len(old)
+        state = {
+            'mean': np.zeros((capacity, n_metrics)),
+            'var': np.zeros((capacity, n_metrics)),
+            'count': np.zeros((capacity, n_metrics), dtype=np.int64),
+            'cusum': np.zeros((capacity, n_metrics)),
+            'cusum_run': np.zeros((capacity, n_metrics), dtype=np.int64),
+            'breach_run': np.zeros((capacity, n_metrics), dtype=np.int64),
+        }
+        for name, array in state.items():
+            if size:
+                array[:size] = getattr(self, name)
+            setattr(self, name, array)
+
+    def _key_ids(self, localities: np.ndarray, network_types: np.ndarray) -> np.ndarray:
+        """Map each (locality, network type) pair to its state row, registering new keys."""
+        pairs = pd.MultiIndex.from_arrays([localities, network_types])
+        codes, uniques = pd.factorize(pairs)
+        ids = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            key = (str(key[0]), str(key[1]))
+            if key not in self.key_index:
+                self.key_index[key] = len(self.keys)
+                self.keys.append(key)
+            ids[i] = self.key_index[key]
+        if len(self.keys) > len(self.mean):
+            self._allocate(max(2 * len(self.mean), len(self.keys)))
+        return ids[codes]
+
+    def ingest(self, measurements) -> List[Dict[str, Any]]:
+        """
+        Update the statistics with a batch of measurements.
+
+        Args:
+            measurements: DataFrame, list of records or dict of columns with
+                ``Locality``, ``Network_Type`` and any of ``Signal_Strength``,
+                ``Data_Throughput``, ``Latency`` (optionally ``Timestamp``).
+                Rows of the same key must be in time order.
+
+        Returns:
+            Alerts raised by this batch
+        """
+        df = measurements if isinstance(measurements, pd.DataFrame) else pd.DataFrame(measurements)
+        if df.empty:
+            return []
+        missing = {'Locality', 'Network_Type'} - set(df.columns)
+        if missing:
+            raise ValueError(f"Measurements are missing columns: {', '.join(sorted(missing))}")
+
+        values = np.column_stack([
+            pd.to_numeric(df[m], errors='coerce').to_numpy(dtype=np.float64) if m in df.columns
+            else np.full(len(df), np.nan)
+            for m in METRICS
+        ])
+        timestamps = df['Timestamp'].astype(str).to_numpy() if 'Timestamp' in df.columns else None
+
+        with self._lock:
+            key_ids = self._key_ids(df['Locality'].to_numpy(), df['Network_Type'].to_numpy())
+
+            # Round r holds every key's r-th measurement of the batch
+            order = np.argsort(key_ids, kind='stable')
+            sorted_keys = key_ids[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            position = np.empty(len(df), dtype=np.int64)
+            position[order] = np.arange(len(df)) - np.repeat(starts, np.diff(np.r_[starts, len(df)]))
+            by_round = np.argsort(position, kind='stable')
+            bounds = np.searchsorted(position[by_round], np.arange(position.max() + 2))
+
+            raised = []
+            for r in range(len(bounds) - 1):
+                rows = by_round[bounds[r]:bounds[r + 1]]
+                raised.extend(self._update(rows, key_ids[rows], values[rows], timestamps))
+            self.measurements += len(df)
+
+            for alert in raised:
+                self.last_seq += 1
+                alert['seq'] = self.last_seq
+                self.alerts.append(alert)
+
+        if raised:
+            with self._new_alerts:
+                self._new_alerts.notify_all()
+        return raised
+
+    def _update(self, rows: np.ndarray, ids: np.ndarray, x: np.ndarray,
+                timestamps: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        """Apply one measurement to each of the keys ``ids`` (all distinct)."""
+        valid = ~np.isnan(x)
+        mean, var, count = self.mean[ids], self.var[ids], self.count[ids]
+
+        # Change points: CUSUM of residuals against the state before this point
+        z = (x - mean) / np.maximum(np.sqrt(var), _MIN_STD) * DEGRADING_DIRECTION
+        armed = valid & (count >= self.warmup)
+        cusum = np.where(armed, np.maximum(0.0, self.cusum[ids] + z - self.cusum_k), self.cusum[ids])
+        # Length of the current CUSUM rise; a single outlier can cross h but not min_run
+        run = np.where(armed, np.where(cusum > 0, self.cusum_run[ids] + 1, 0), self.cusum_run[ids])
+        change = (cusum > self.cusum_h) & (run >= self.min_run)
+        self.cusum[ids] = np.where(change, 0.0, cusum)
+        self.cusum_run[ids] = np.where(change, 0, run)
+
+        # Threshold breaches, reported once when a breach has lasted min_run measurements
+        with np.errstate(invalid='ignore'):
+            breach = (x - THRESHOLDS) * DEGRADING_DIRECTION > 0
+        breach_run = np.where(valid, np.where(breach, self.breach_run[ids] + 1, 0), self.breach_run[ids])
+        entered = valid & (breach_run == self.min_run)
+        self.breach_run[ids] = breach_run
+
+        # EWMA mean and variance; the first measurement initializes the mean
+        delta = np.where(valid, x - mean, 0.0)
+        first = valid & (count == 0)
+        self.mean[ids] = np.where(first, x, mean + self.alpha * delta)
+        self.var[ids] = np.where(first, 0.0, (1 - self.alpha) * (var + self.alpha * delta ** 2))
+        self.count[ids] = count + valid
+
+        alerts = []
+        for i, j in zip(*np.nonzero(change | entered)):
+            key = self.keys[ids[i]]
+            alert = {
+                'type': 'change_point' if change[i, j] else 'threshold',
+                'locality': key[0],
+                'network_type': key[1],
+                'metric': METRICS[j],
+                'value': float(x[i, j]),
+                'timestamp': timestamps[rows[i]] if timestamps is not None else None,
+                'detected_at': datetime.now().isoformat(),
+            }
+            if change[i, j]:
+                alert['baseline_mean'] = float(mean[i, j])
+                alert['baseline_std'] = float(np.sqrt(var[i, j]))
+            else:
+                alert['threshold'] = float(THRESHOLDS[j])
+            alerts.append(alert)
+        return alerts
+
+    def alerts_since(self, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Buffered alerts with ``seq`` greater than ``since``, oldest first.
+
+        A ``since`` ahead of ``last_seq`` comes from a client that saw an
+        earlier process (the counter restarts with the server), so it gets
+        every buffered alert instead of waiting for the counter to catch up.
+        """
+        with self._lock:
+            if since > self.last_seq:
+                since = 0
+            # seq is contiguous, so the first match is found by offset
+            skip = max(0, len(self.alerts) - (self.last_seq - since))
+            alerts = [self.alerts[i] for i in range(skip, len(self.alerts))]
+        return alerts[:limit] if limit else alerts
+
+    def get_state(self, locality: str, network_type: str) -> Dict[str, Any]:
+        """Current running statistics for one key."""
+        key = (str(locality), str(network_type))
+        if key not in self.key_index:
+            raise ValueError(f"No measurements for {locality} / {network_type}")
+        k = self.key_index[key]
+        with self._lock:
+            return {
+                metric: {
+                    'mean': float(self.mean[k, j]),
+                    'std': float(np.sqrt(self.var[k, j])),
+                    'count': int(self.count[k, j]),
+                    'cusum': float(self.cusum[k, j]),
+                    'in_breach': bool(self.breach_run[k, j] >= self.min_run),
+                }
+                for j, metric in enumerate(METRICS)
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'keys': len(self.keys),
+            'measurements': self.measurements,
+            'last_seq': self.last_seq,
+        }
+
+    def stream(self, since: int = 0, heartbeat: float = 15.0) -> Iterator[str]:
+        """
+        Server-sent events for alerts after ``since``, blocking between batches.
+
+        Yields ``id``/``data`` events, and a comment line every ``heartbeat``
+        seconds so proxies keep the connection open.
+        """
+        while True:
+            if since > self.last_seq:
+                # Resuming from an event ID issued before a restart
+                since = 0
+            alerts = self.alerts_since(since)
+            for alert in alerts:
+                yield f"id: {alert['seq']}\nevent: alert\ndata: {json.dumps(alert)}\n\n"
+            if alerts:
+                since = alerts[-1]['seq']
+                continue
+            with self._new_alerts:
+                deadline = time.monotonic() + heartbeat
+                while self.last_seq <= since and time.monotonic() < deadline:
+                    self._new_alerts.wait(deadline - time.monotonic())
+            if self.last_seq <= since:
+                yield ": keep-alive\n\n"
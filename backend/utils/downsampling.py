@@ -0,0 +1,191 @@
+"""Shape-preserving downsampling for forecast and trend series."""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DOWNSAMPLING_METHODS = ('lttb', 'minmax')
+
+# Parallel per-point lists in forecast responses, sliced with the same indices
+PARALLEL_SERIES_KEYS = ('predictions', 'confidence_intervals')
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection.
+
+    Keeps the first and last points and, from each of ``n_out - 2`` equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's mean. Points are assumed
+    evenly spaced, as forecast steps are.
+
+    Args:
+        y: Series values
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        Sorted indices into ``y``
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("max_points must be at least 3")
+
+    # Missing values never win a bucket, but the bucket keeps its slot
+    finite = np.isfinite(y)
+    y_filled = np.where(finite, y, np.nanmean(y) if finite.any() else 0.0)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        next_start, next_end = end, (edges[b + 2] if b + 2 < len(edges) else n)
+        next_x = (next_start + next_end - 1) / 2
+        next_y = y_filled[next_start:next_end].mean()
+
+        x = np.arange(start, end)
+        area = np.abs((previous - next_x) * (y_filled[start:end] - y_filled[previous])
+                      - (previous - x) * (next_y - y_filled[previous]))
+        area[~finite[start:end]] = -np.inf
+        previous = start + int(np.argmax(area))
+        selected[b + 1] = previous
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max bucketing: the lowest and highest point of each bucket.
+
+    Keeps every peak and trough exactly, at the cost of using two points per
+    bucket (``n_out // 2`` buckets).
+
+    Returns:
+        Sorted indices into ``y``
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("max_points must be at least 3")
+
+    n_buckets = max(1, (n_out - 2) // 2)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    # Pad buckets into one (n_buckets, width) block so argmin/argmax run once
+    width = int((ends - starts).max())
+    positions = starts[:, None] + np.arange(width)
+    valid = positions < ends[:, None]
+    block = y[np.minimum(positions, n - 1)]
+    lows = np.argmin(np.where(valid & np.isfinite(block), block, np.inf), axis=1)
+    highs = np.argmax(np.where(valid & np.isfinite(block), block, -np.inf), axis=1)
+    picked = np.concatenate([[0, n - 1], starts + lows, starts + highs])
+    return np.unique(picked)
+
+
+def downsample_indices(y: np.ndarray, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """Indices of at most ``max_points`` points preserving the shape of ``y``."""
+    if method == 'lttb':
+        return lttb_indices(y, max_points)
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    raise ValueError(f"Unknown downsampling method '{method}' (use one of {', '.join(DOWNSAMPLING_METHODS)})")
+
+
+def downsample_forecast(result: Dict[str, Any], value_key: str, max_points: Optional[int],
+                        method: str = 'lttb') -> Dict[str, Any]:
+    """
+    Downsample a forecast response in place.
+
+    Points are chosen on the point forecast (``value_key`` of each entry in
+    ``predictions``), and the same indices are applied to every parallel
+    per-point list (``confidence_intervals``), so bands stay aligned with
+    the forecast they belong to.
+
+    Args:
+        result: Predictor response with a ``predictions`` list
+        value_key: Field of each prediction holding the point forecast
+        max_points: Maximum number of points to return (None disables)
+        method: ``'lttb'`` or ``'minmax'``
+
+    Returns:
+        The same ``result``, with a ``downsampling`` entry when points were dropped
+    """
+    predictions = result.get('predictions') or []
+    if max_points is None or len(predictions) <= max_points:
+        return result
+
+    values = np.array([p.get(value_key, np.nan) for p in predictions], dtype=np.float64)
+    indices = downsample_indices(values, max_points, method).tolist()
+    for key in PARALLEL_SERIES_KEYS:
+        series = result.get(key)
+        if isinstance(series, list) and len(series) == len(predictions):
+            result[key] = [series[i] for i in indices]
+    result['downsampling'] = {
+        'method': method,
+        'original_points': len(predictions),
+        'returned_points': len(indices),
+    }
+    return result
+
+
+def resample_trends(trends: List[Dict[str, Any]], resolution: Optional[str] = None,
+                    max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Re-bin network usage trends (``{network_type, dates, counts}``) to a coarser resolution.
+
+    Counts are summed per bin, and all trends share the same bin edges so
+    their dates stay aligned. With ``max_points`` and no explicit
+    ``resolution``, the bin width is the smallest whole number of minutes
+    that keeps every trend within ``max_points`` points.
+
+    Args:
+        trends: Trend series as returned by the network usage analyzer
+        resolution: Pandas offset alias, e.g. ``'1h'``, ``'1D'``, ``'1W'``
+        max_points: Upper bound on points per trend
+
+    Returns:
+        New list of trends
+    """
+    import pandas as pd
+
+    if not trends or (resolution is None and max_points is None):
+        return trends
+
+    series = [pd.Series(np.asarray(t['counts'], dtype=np.float64), index=pd.to_datetime(t['dates']))
+              for t in trends]
+    origin = min(s.index.min() for s in series if len(s)).normalize()
+    end = max(s.index.max() for s in series if len(s))
+
+    if resolution is None:
+        if max(len(s) for s in series) <= max_points:
+            return trends
+        if max_points < 2:
+            raise ValueError("max_points must be at least 2")
+        minutes = int(np.ceil((end - origin) / pd.Timedelta(minutes=1) / (max_points - 1))) or 1
+        resolution = f"{minutes}min"
+
+    # Calendar offsets (days in recent pandas, weeks, months) align to their own boundaries
+    offset = pd.tseries.frequencies.to_offset(resolution)
+    anchor = {'origin': origin} if isinstance(offset, pd.offsets.Tick) else {}
+
+    resampled = []
+    for trend, s in zip(trends, series):
+        binned = s.resample(offset, **anchor).sum(min_count=1).dropna()
+        dates = binned.index
+        date_only = (dates == dates.normalize()).all()
+        resampled.append({
+            **trend,
+            'dates': dates.strftime('%Y-%m-%d').tolist() if date_only else [d.isoformat() for d in dates],
+            'counts': binned.round().astype(np.int64).tolist(),
+        })
+    return resampled
@@ -0,0 +1,163 @@
+"""Sparse id-indexed feature store for the network-fault prediction tables."""
+
+import pickle
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MODELS_DIR
+
+# Table name -> (token column, value column or None for multi-hot)
+FAULT_TABLES = {
+    'event_type': ('event_type', None),
+    'resource_type': ('resource_type', None),
+    'severity_type': ('severity_type', None),
+    'log_feature': ('log_feature', 'volume'),
+}
+
+
+class FaultFeatureStore:
+    """
+    One sparse CSR matrix of per-id features, built from the fault tables.
+
+    Columns are a fixed vocabulary fitted once and persisted with the model:
+    multi-hot ``event_type``, ``resource_type`` and ``severity_type`` plus
+    ``log_feature`` volumes. Unlike joining the tables with
+    ``drop_duplicates(subset=['id'])``, every event, resource and log feature
+    of an id is kept, and looking up a batch of ids is a row slice rather than
+    a chain of merges. ``location`` (from train/test) is one-hot encoded with
+    the same fixed vocabulary at training and inference time.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, List[str]] = {}
+        self.locations: List[str] = []
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.store_path = MODELS_DIR / "fault_feature_store.pkl"
+
+    @property
+    def feature_names(self) -> List[str]:
+        names = []
+        for table, (column, value_column) in FAULT_TABLES.items():
+            names.extend(f"{column}={token}" for token in self.vocabulary[table])
+        names.extend(f"location={location}" for location in self.locations)
+        return names
+
+    @property
+    def n_table_features(self) -> int:
+        return sum(len(tokens) for tokens in self.vocabulary.values())
+
+    def fit(self, tables: Dict[str, pd.DataFrame], locations: pd.Series) -> 'FaultFeatureStore':
+        """
+        Fit the vocabulary and index the tables.
+
+        Args:
+            tables: ``event_type``, ``resource_type``, ``severity_type`` and
+                ``log_feature`` frames as read from the competition CSVs
+            locations: Training ``location`` column
+
+        Returns:
+            self
+        """
+        tables = {name: _clean_ids(tables[name]) for name in FAULT_TABLES}
+        for name, (column, _) in FAULT_TABLES.items():
+            self.vocabulary[name] = sorted(tables[name][column].astype(str).unique())
+        self.locations = sorted(locations.astype(str).unique())
+        return self.index(tables)
+
+    def index(self, tables: Dict[str, pd.DataFrame]) -> 'FaultFeatureStore':
+        """
+        (Re)build the id-indexed matrix from tables using the fixed vocabulary.
+
+        Tokens outside the vocabulary are ignored, so newly exported tables
+        can be indexed without changing the model's feature layout.
+        """
+        tables = {name: _clean_ids(tables[name]) for name in FAULT_TABLES}
+        max_id = int(max(table['id'].max() for table in tables.values()))
+
+        rows, cols, data = [], [], []
+        offset = 0
+        for name, (column, value_column) in FAULT_TABLES.items():
+            table = tables[name]
+            if value_column is None:
+                table = table.drop_duplicates(subset=['id', column])
+            codes = pd.Categorical(table[column].astype(str), categories=self.vocabulary[name]).codes
+            known = codes >= 0
+            rows.append(table['id'].to_numpy(dtype=np.int64)[known])
+            cols.append(codes[known].astype(np.int64) + offset)
+            values = (table[value_column].to_numpy(dtype=np.float64) if value_column
+                      else np.ones(len(table)))
+            data.append(values[known])
+            offset += len(self.vocabulary[name])
+
+        # Row max_id + 1 stays empty and serves ids that were never seen
+        matrix = sparse.coo_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(max_id + 2, offset))
+        self.matrix = matrix.tocsr()
+        self.matrix.sum_duplicates()
+        return self
+
+    def rows(self, ids) -> sparse.csr_matrix:
+        """Table features for a batch of ids (all-zero rows for unknown ids)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        empty_row = self.matrix.shape[0] - 1
+        in_range = (ids >= 0) & (ids < empty_row)
+        return self.matrix[np.where(in_range, ids, empty_row)]
+
+    def transform(self, frame: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Full feature matrix for train/test rows (``id`` and ``location`` columns).
+
+        Returns:
+            CSR matrix with one row per frame row, columns as ``feature_names``
+        """
+        location_codes = pd.Categorical(frame['location'].astype(str), categories=self.locations).codes
+        known = location_codes >= 0
+        location_matrix = sparse.csr_matrix(
+            (np.ones(known.sum()), (np.flatnonzero(known), location_codes[known])),
+            shape=(len(frame), len(self.locations)))
+        return sparse.hstack([self.rows(frame['id'].to_numpy()), location_matrix], format='csr')
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Save vocabulary and matrix next to the fault model."""
+        path = Path(path or self.store_path)
+        with open(path, 'wb') as f:
+            pickle.dump({'vocabulary': self.vocabulary, 'locations': self.locations,
+                         'matrix': self.matrix}, f)
+        print(f"Fault feature store saved to {path}")
+        return path
+
+    def load(self, path: Optional[Path] = None) -> 'FaultFeatureStore':
+        """Load a saved feature store."""
+        path = Path(path or self.store_path)
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        self.vocabulary = state['vocabulary']
+        self.locations = state['locations']
+        self.matrix = state['matrix']
+        print(f"Fault feature store loaded from {path}")
+        return self
+
+
+def _clean_ids(table: pd.DataFrame) -> pd.DataFrame:
+    """Coerce ``id`` to integers, dropping rows mangled by bad CSV lines."""
+    table = table.copy()
+    table['id'] = pd.to_numeric(table['id'], errors='coerce')
+    table = table.dropna(subset=['id'])
+    table['id'] = table['id'].astype(np.int64)
+    return table
+
+
+def load_fault_tables(input_dir: Path) -> Dict[str, pd.DataFrame]:
+    """Read the fault tables from the competition input directory."""
+    input_dir = Path(input_dir)
+    return {name: pd.read_csv(input_dir / f"{name}.csv", on_bad_lines='skip')
+            for name in FAULT_TABLES}
@@ -0,0 +1,213 @@
+"""Flat-array inference engine for scikit-learn random forests."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MODELS_DIR
+
+# Rows evaluated per block; bounds the (rows x trees) node index matrix
+BATCH_ROWS = 4096
+
+# One record per node, so a depth step gathers everything it needs in one take
+NODE_DTYPE = np.dtype([('feature', np.int64), ('threshold', np.float64),
+                       ('left', np.int64), ('missing_go_right', np.bool_)], align=True)
+
+_ARRAYS = ('nodes', 'value', 'roots')
+
+
+def _breadth_first_layout(tree) -> np.ndarray:
+    """New index of every node such that each node's two children are adjacent (right = left + 1)."""
+    left, right = tree.children_left, tree.children_right
+    new_index = np.empty(tree.node_count, dtype=np.int64)
+    new_index[0] = 0
+    order, next_index = [0], 1
+    for node in order:
+        if left[node] != -1:
+            new_index[left[node]], new_index[right[node]] = next_index, next_index + 1
+            order.extend((left[node], right[node]))
+            next_index += 2
+    return new_index
+
+
+class CompiledForest:
+    """
+    A trained forest flattened into contiguous node arrays.
+
+    All trees share one ``nodes`` record array (feature, threshold, index of
+    the left child and missing-value direction per node) and a ``value``
+    array holding each node's prediction. Nodes are laid out breadth-first
+    so the right child always follows the left one, and leaves point to
+    themselves with an infinite threshold. Evaluation walks every row
+    through every tree at once, one depth level per step: a step is one
+    gather of node records, one gather of feature values, a comparison and
+    an add, so a batch costs ``max_depth`` short vectorized steps regardless
+    of the number of trees.
+
+    Predictions match the source ``RandomForestRegressor`` /
+    ``RandomForestClassifier`` (``predict`` and ``predict_proba``).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        # Plain ndarray views: np.take on np.memmap pays subclass overhead on every call
+        self.nodes = np.asarray(arrays['nodes'])
+        self.value = np.asarray(arrays['value'])
+        self.roots = np.asarray(arrays['roots'])
+        self.meta = meta
+        self.is_classifier = meta['kind'] == 'classifier'
+        self.classes_ = np.asarray(meta['classes']) if self.is_classifier else None
+        self.n_features = meta['n_features']
+        self.max_depth = meta['max_depth']
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'CompiledForest':
+        """
+        Compile a fitted scikit-learn forest.
+
+        Args:
+            model: Fitted RandomForest/ExtraTrees regressor or classifier
+
+        Returns:
+            CompiledForest: Flat-array equivalent of ``model``
+        """
+        is_classifier = hasattr(model, 'classes_')
+        if is_classifier and getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Multi-output classifiers are not supported")
+
+        nodes, values, roots = [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            new_index = _breadth_first_layout(tree)
+            is_leaf = tree.children_left == -1
+
+            records = np.empty(n_nodes, dtype=NODE_DTYPE)
+            records['feature'][new_index] = np.where(is_leaf, 0, tree.feature)
+            # Leaves compare against +inf (and send NaN left) so they stay on themselves
+            records['threshold'][new_index] = np.where(is_leaf, np.inf, tree.threshold)
+            records['left'][new_index] = offset + np.where(
+                is_leaf, new_index, new_index[np.where(is_leaf, 0, tree.children_left)])
+            missing_left = np.asarray(getattr(tree, 'missing_go_to_left',
+                                              np.ones(n_nodes, dtype=np.uint8)), dtype=bool)
+            records['missing_go_right'][new_index] = ~missing_left & ~is_leaf
+            nodes.append(records)
+
+            if is_classifier:
+                value = tree.value[:, 0, :]
+                value = value / value.sum(axis=1, keepdims=True)
+            else:
+                value = tree.value[:, :, 0]
+            reordered = np.empty_like(value)
+            reordered[new_index] = value
+            values.append(reordered)
+
+            roots.append(offset)
+            offset += n_nodes
+
+        arrays = {
+            'nodes': np.concatenate(nodes),
+            'value': np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            'roots': np.asarray(roots, dtype=np.int64),
+        }
+        meta = {
+            'kind': 'classifier' if is_classifier else 'regressor',
+            'classes': model.classes_.tolist() if is_classifier else None,
+            'n_features': int(model.n_features_in_),
+            'n_outputs': int(arrays['value'].shape[1]) if not is_classifier else 1,
+            'n_trees': len(roots),
+            'max_depth': int(max(e.tree_.max_depth for e in model.estimators_)),
+        }
+        return cls(arrays, meta)
+
+    def _leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """Mean of the reached leaf values over all trees, for each row."""
+        # Trees split on float32 features, so compare exactly as sklearn does
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features}")
+
+        out = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+        has_missing = np.isnan(X).any()
+        nodes = self.nodes
+
+        for start in range(0, len(X), BATCH_ROWS):
+            block = np.ascontiguousarray(X[start:start + BATCH_ROWS])
+            n_rows = len(block)
+            # A single row indexes its features directly; larger blocks offset into the flattened rows
+            if n_rows == 1:
+                node, row_offset = self.roots[None, :], None
+            else:
+                node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+                row_offset = (np.arange(n_rows) * self.n_features)[:, None]
+            block = block.reshape(-1)
+
+            for _ in range(self.max_depth):
+                record = nodes.take(node)
+                feature = record['feature'] if row_offset is None else record['feature'] + row_offset
+                x = block.take(feature)
+                go_right = x > record['threshold']
+                if has_missing:
+                    go_right = np.where(np.isnan(x), record['missing_go_right'], go_right)
+                node = record['left'] + go_right
+
+            out[start:start + n_rows] = np.add.reduce(self.value.take(node, axis=0), axis=1) / len(self.roots)
+
+        return out
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict regression targets, or class labels for a classifier."""
+        values = self._leaf_values(X)
+        if self.is_classifier:
+            return self.classes_[np.argmax(values, axis=1)]
+        return values[:, 0] if values.shape[1] == 1 else values
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Predict class probabilities (classifiers only)."""
+        if not self.is_classifier:
+            raise ValueError("predict_proba is only available for classifiers")
+        return self._leaf_values(X)
+
+    def save(self, name: str, directory: Optional[Path] = None) -> Path:
+        """
+        Save the node arrays as ``.npy`` files so they can be memory-mapped.
+
+        Args:
+            name: Model name, e.g. ``throughput_Locality_001_4G``
+            directory: Store root (default: ``MODELS_DIR/compiled``)
+
+        Returns:
+            Path: Directory holding the arrays
+        """
+        path = Path(directory or MODELS_DIR / "compiled") / name
+        path.mkdir(parents=True, exist_ok=True)
+        for array_name in _ARRAYS:
+            np.save(path / f"{array_name}.npy", getattr(self, array_name))
+        with open(path / "meta.json", 'w') as f:
+            json.dump(self.meta, f)
+        return path
+
+    @classmethod
+    def load(cls, name: str, directory: Optional[Path] = None, mmap: bool = True) -> 'CompiledForest':
+        """
+        Load a compiled forest, memory-mapping its arrays by default.
+
+        Memory-mapped forests load in constant time and share pages between
+        processes serving the same model.
+        """
+        path = Path(directory or MODELS_DIR / "compiled") / name
+        if not (path / "meta.json").exists():
+            raise FileNotFoundError(f"No compiled forest found at {path}")
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        arrays = {array_name: np.load(path / f"{array_name}.npy", mmap_mode='r' if mmap else None)
+                  for array_name in _ARRAYS}
+        return cls(arrays, meta)
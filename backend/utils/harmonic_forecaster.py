@@ -0,0 +1,240 @@
+"""Lightweight harmonic-regression forecasting engine (alternative to Prophet)."""
+
+import json
+import pickle
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import MODELS_DIR, SIGNAL_FORECAST_ENGINE, TIME_INTERVAL_MINUTES
+from utils.model_utils import normal_quantile
+
+KEY_COLUMNS = ['Locality', 'Network_Type']
+
+# Per-key engine choices written by benchmarks/compare_forecast_engines.py
+ENGINE_SELECTION_PATH = MODELS_DIR / "forecast_engine_selection.json"
+
+
+class HarmonicForecaster:
+    """
+    Seasonal least-squares regression fitted for every key at once.
+
+    Each series is modelled as a linear trend plus daily and weekly Fourier
+    terms. All (locality, network_type) keys share one design matrix layout,
+    so their normal equations are accumulated with ``np.bincount`` and solved
+    together with one batched ``np.linalg.inv``. Prediction intervals
+    are analytic: ``sigma² (1 + x0ᵀ (XᵀX)⁻¹ x0)`` under Gaussian residuals.
+    A key with no more observations than parameters fits its data exactly,
+    so its ``sigma²`` is the residual variance pooled over the other keys.
+    """
+
+    def __init__(self, daily_order: int = 3, weekly_order: int = 2,
+                 interval_width: float = 0.95, ridge: float = 1e-6):
+        """
+        Args:
+            daily_order: Number of daily Fourier pairs
+            weekly_order: Number of weekly Fourier pairs
+            interval_width: Coverage of the prediction intervals
+            ridge: Diagonal regularization keeping short series solvable
+        """
+        self.daily_order = daily_order
+        self.weekly_order = weekly_order
+        self.interval_width = interval_width
+        self.ridge = ridge
+        self.keys: List[Tuple[str, str]] = []
+        self.key_index: Dict[Tuple[str, str], int] = {}
+        self.origin: Optional[pd.Timestamp] = None
+        self.coef = None
+        self.xtx_inv = None
+        self.sigma2 = None
+        self.n_obs = None
+        self.last_timestamp: Dict[Tuple[str, str], pd.Timestamp] = {}
+
+    @property
+    def n_params(self) -> int:
+        return 2 + 2 * (self.daily_order + self.weekly_order)
+
+    def design_matrix(self, timestamps) -> np.ndarray:
+        """Intercept, trend (years since origin), daily and weekly Fourier terms."""
+        days = (pd.DatetimeIndex(timestamps) - self.origin) / pd.Timedelta(days=1)
+        days = np.asarray(days, dtype=np.float64)
+        columns = [np.ones_like(days), days / 365.25]
+        for period, order in ((1.0, self.daily_order), (7.0, self.weekly_order)):
+            for k in range(1, order + 1):
+                angle = 2 * np.pi * k * days / period
+                columns.extend([np.sin(angle), np.cos(angle)])
+        return np.column_stack(columns)
+
+    def fit(self, df: pd.DataFrame, target: str = 'Signal_Strength') -> 'HarmonicForecaster':
+        """
+        Fit every (locality, network_type) series in one batched solve.
+
+        Args:
+            df: Preprocessed dataframe
+            target: Column to forecast
+
+        Returns:
+            self
+        """
+        df = df.dropna(subset=['Timestamp', target])
+        self.origin = df['Timestamp'].min()
+
+        groups = df.groupby(KEY_COLUMNS, observed=True, sort=True)
+        group_ids = groups.ngroup().to_numpy()
+        self.keys = [tuple(str(v) for v in key) for key in groups.groups.keys()]
+        self.key_index = {key: i for i, key in enumerate(self.keys)}
+        self.last_timestamp = {tuple(str(v) for v in key): ts
+                               for key, ts in groups['Timestamp'].max().items()}
+        n_keys, p = len(self.keys), self.n_params
+
+        X = self.design_matrix(df['Timestamp'])
+        y = df[target].to_numpy(dtype=np.float64)
+
+        # Normal equations per key: one bincount per upper-triangle entry
+        xtx = np.empty((n_keys, p, p))
+        for i in range(p):
+            for j in range(i, p):
+                xtx[:, i, j] = xtx[:, j, i] = np.bincount(group_ids, weights=X[:, i] * X[:, j],
+                                                          minlength=n_keys)
+        xty = np.stack([np.bincount(group_ids, weights=X[:, i] * y, minlength=n_keys)
+                        for i in range(p)], axis=1)
+        yty = np.bincount(group_ids, weights=y * y, minlength=n_keys)
+        n_obs = np.bincount(group_ids, minlength=n_keys)
+
+        regularized = xtx + self.ridge * np.eye(p) * np.maximum(n_obs, 1)[:, None, None]
+        self.xtx_inv = np.linalg.inv(regularized)
+        self.coef = np.einsum('kij,kj->ki', self.xtx_inv, xty)
+
+        sse = yty - 2 * np.einsum('ki,ki->k', self.coef, xty) \
+            + np.einsum('ki,kij,kj->k', self.coef, xtx, self.coef)
+        sse = np.maximum(sse, 0)
+        determined = n_obs > p
+        if determined.any():
+            pooled = sse[determined].sum() / (n_obs[determined] - p).sum()
+        else:
+            pooled = float(np.var(y)) if len(y) else np.nan
+        self.sigma2 = np.where(determined, sse / np.maximum(n_obs - p, 1), pooled)
+        self.n_obs = n_obs
+        return self
+
+    def is_determined(self, locality: str, network_type: str) -> bool:
+        """Whether a key has more observations than the model has parameters."""
+        k = self.key_index.get((str(locality), str(network_type)))
+        return k is not None and self.n_obs[k] > self.n_params
+
+    def forecast(self, locality: str, network_type: str, timestamps) -> pd.DataFrame:
+        """
+        Forecast one key at the given timestamps.
+
+        Returns:
+            DataFrame with Prophet-style ``ds``, ``yhat``, ``yhat_lower`` and
+            ``yhat_upper`` columns
+        """
+        key = (str(locality), str(network_type))
+        if key not in self.key_index:
+            raise ValueError(f"No harmonic model for {locality} / {network_type}")
+        k = self.key_index[key]
+
+        X = self.design_matrix(timestamps)
+        yhat = X @ self.coef[k]
+        variance = self.sigma2[k] * (1 + np.einsum('ti,ij,tj->t', X, self.xtx_inv[k], X))
+        margin = normal_quantile((1 + self.interval_width) / 2) * np.sqrt(variance)
+        return pd.DataFrame({
+            'ds': pd.DatetimeIndex(timestamps),
+            'yhat': yhat,
+            'yhat_lower': yhat - margin,
+            'yhat_upper': yhat + margin,
+        })
+
+    def predict(self, locality: str, network_type: str, hours_ahead: int = 24) -> pd.DataFrame:
+        """Forecast ``hours_ahead`` hours past the key's last observation."""
+        key = (str(locality), str(network_type))
+        if key not in self.last_timestamp:
+            raise ValueError(f"No harmonic model for {locality} / {network_type}")
+        step = timedelta(minutes=TIME_INTERVAL_MINUTES)
+        periods = max(1, int(hours_ahead * 60 / TIME_INTERVAL_MINUTES))
+        timestamps = pd.date_range(self.last_timestamp[key] + step, periods=periods, freq=step)
+        return self.forecast(locality, network_type, timestamps)
+
+    def predict_response(self, locality: str, network_type: str, hours_ahead: int = 24,
+                         value_key: str = 'predicted_signal_strength') -> Dict[str, object]:
+        """Forecast in the response format of ``SignalStrengthPredictor.predict``."""
+        forecast = self.predict(locality, network_type, hours_ahead)
+        return {
+            'locality': locality,
+            'network_type': network_type,
+            'engine': 'harmonic',
+            'predictions': [
+                {'timestamp': ts.isoformat(), value_key: yhat, 'lower_bound': lower, 'upper_bound': upper}
+                for ts, yhat, lower, upper in zip(forecast['ds'], forecast['yhat'].tolist(),
+                                                  forecast['yhat_lower'].tolist(), forecast['yhat_upper'].tolist())
+            ],
+        }
+
+    def predict_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Point forecasts for every row of ``df``, each from its own key's model (NaN if unknown)."""
+        rows = pd.MultiIndex.from_arrays([df['Locality'].astype(str), df['Network_Type'].astype(str)])
+        index = pd.MultiIndex.from_tuples(self.keys).get_indexer(rows)
+        known = index >= 0
+        yhat = np.full(len(df), np.nan)
+        X = self.design_matrix(df['Timestamp'][known])
+        yhat[known] = np.einsum('ti,ti->t', X, self.coef[index[known]])
+        return yhat
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Save the fitted coefficients to disk."""
+        path = Path(path or MODELS_DIR / "harmonic_forecaster.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+        print(f"Harmonic forecaster saved to {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> 'HarmonicForecaster':
+        """Load a fitted forecaster from disk."""
+        path = Path(path or MODELS_DIR / "harmonic_forecaster.pkl")
+        forecaster = cls()
+        with open(path, 'rb') as f:
+            forecaster.__dict__.update(pickle.load(f))
+        return forecaster
+
+
+# Parsed selection report and the modification time it was read at
+_selection_cache: Tuple[Optional[float], Dict[str, str]] = (None, {})
+
+
+def _engine_selection() -> Dict[str, str]:
+    """Per-key engine choices, re-read only when the report file changes."""
+    global _selection_cache
+    try:
+        mtime = ENGINE_SELECTION_PATH.stat().st_mtime
+    except FileNotFoundError:
+        _selection_cache = (None, {})
+        return {}
+    if _selection_cache[0] != mtime:
+        with open(ENGINE_SELECTION_PATH) as f:
+            _selection_cache = (mtime, json.load(f))
+    return _selection_cache[1]
+
+
+def select_engine(locality: str, network_type: str) -> str:
+    """
+    Forecast engine to use for a key: ``'prophet'`` or ``'harmonic'``.
+
+    Uses the per-key choice from the latest engine comparison report when
+    one exists, otherwise ``SIGNAL_FORECAST_ENGINE``. The signal strength
+    endpoint dispatches on it.
+    """
+    return _engine_selection().get(f"{locality}|{network_type}", SIGNAL_FORECAST_ENGINE)
+
+
+def harmonic_fit_predict(train_df: pd.DataFrame, test_df: pd.DataFrame) -> np.ndarray:
+    """Backtest adapter for ``HarmonicForecaster`` on signal strength."""
+    return HarmonicForecaster().fit(train_df, 'Signal_Strength').predict_rows(test_df)
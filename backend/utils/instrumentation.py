@@ -0,0 +1,310 @@
+"""Request and training instrumentation exposed in Prometheus text format."""
+
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import PROFILE_SLOW_REQUESTS_MS, PROFILE_SAMPLE_INTERVAL_MS, PROFILES_DIR
+
+
+# Histogram buckets (seconds) for request and stage latencies
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histogram buckets (seconds) for training stages, which run far longer
+TRAINING_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket boundaries."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, float]] = {}
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, metric_type: str, help_text: str,
+                 buckets: Optional[Tuple[float, ...]] = None):
+        """Register metric metadata used for the ``# HELP``/``# TYPE`` lines."""
+        self._help[name] = (metric_type, help_text)
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1.0):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def counter_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(store):
+                    lines.extend(self._header(name, kind))
+                    for labels, value in sorted(store[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                lines.extend(self._header(name, "histogram"))
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        bucket_labels = labels + (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    bucket_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name: str, default_type: str) -> List[str]:
+        metric_type, help_text = self._help.get(name, (default_type, ""))
+        header = [f"# TYPE {name} {metric_type}"]
+        if help_text:
+            header.insert(0, f"# HELP {name} {help_text}")
+        return header
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelSet:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="{v.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+registry = MetricsRegistry()
+registry.describe("http_request_duration_seconds", "histogram",
+                  "End-to-end request latency by route.")
+registry.describe("http_requests_total", "counter", "Requests served by route and status.")
+registry.describe("http_request_stage_duration_seconds", "histogram",
+                  "Duration of named stages inside a request.")
+registry.describe("training_stage_duration_seconds", "histogram",
+                  "Duration of model initialization and training stages.", TRAINING_BUCKETS)
+registry.describe("cache_requests_total", "counter", "Cache lookups by cache and result.")
+registry.describe("cache_hit_ratio", "gauge", "Fraction of cache lookups that were hits.")
+registry.describe("slow_requests_profiled_total", "counter",
+                  "Slow requests for which a sampling profile was written.")
+
+_request_state = threading.local()
+
+
+def _current_route() -> str:
+    return getattr(_request_state, "route", None) or "background"
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a named sub-stage of the current request.
+
+    Outside a request the stage is recorded under the ``background`` route.
+
+    Args:
+        name: Stage name, e.g. ``data_fetch``, ``filter``, ``aggregate``,
+            ``model_predict`` or ``serialize``
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe("http_request_stage_duration_seconds", time.perf_counter() - start,
+                         {"route": _current_route(), "stage": name})
+
+
+@contextmanager
+def training_stage(name: str) -> Iterator[None]:
+    """Time a named model initialization or training stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe("training_stage_duration_seconds", elapsed, {"stage": name})
+        print(f"Stage '{name}' took {elapsed:.2f}s")
+
+
+def record_cache(cache: str, hit: bool):
+    """Record a cache lookup and refresh that cache's hit ratio."""
+    registry.inc("cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+    hits = registry.counter_value("cache_requests_total", {"cache": cache, "result": "hit"})
+    misses = registry.counter_value("cache_requests_total", {"cache": cache, "result": "miss"})
+    registry.set("cache_hit_ratio", hits / (hits + misses), {"cache": cache})
+
+
+class SlowRequestProfiler:
+    """
+    Sampling profiler for slow requests.
+
+    A single daemon thread periodically samples the stack of every thread
+    that is serving a request. When a request finishes slower than the
+    threshold, its samples are written as collapsed stacks (one
+    ``frame;frame;frame count`` line per unique stack, the format consumed
+    by flamegraph tools) to ``PROFILES_DIR``.
+    """
+
+    def __init__(self, threshold_ms: float, interval_ms: float, output_dir: Path):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        self.output_dir = Path(output_dir)
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True,
+                                        name="slow-request-profiler")
+        self._thread.start()
+
+    def begin(self):
+        with self._lock:
+            self._active[threading.get_ident()] = Counter()
+
+    def end(self, route: str, elapsed: float):
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if samples and elapsed >= self.threshold:
+            self._write_profile(route, elapsed, samples)
+
+    def _sample_loop(self):
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[_collapse_stack(frame)] += 1
+
+    def _write_profile(self, route: str, elapsed: float, samples: Counter):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        safe_route = route.strip('/').replace('/', '_') or 'root'
+        path = self.output_dir / f"{stamp}-{safe_route}-{int(elapsed * 1000)}ms.collapsed"
+        with open(path, 'w') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        registry.inc("slow_requests_profiled_total", {"route": route})
+        print(f"Slow request {route} took {elapsed * 1000:.0f}ms; profile written to {path}")
+
+
+def _collapse_stack(frame) -> str:
+    entries = [f"{f.name} ({Path(f.filename).name}:{f.lineno})"
+               for f in traceback.extract_stack(frame)]
+    return ";".join(entries)
+
+
+def init_app(app, profile_slow_requests_ms: Optional[float] = None):
+    """
+    Attach request instrumentation and the ``/metrics`` endpoint to a Flask app.
+
+    Args:
+        app: Flask application
+        profile_slow_requests_ms: Requests slower than this are profiled;
+            defaults to ``PROFILE_SLOW_REQUESTS_MS`` (0 disables profiling)
+    """
+    from flask import Response, request
+
+    threshold = PROFILE_SLOW_REQUESTS_MS if profile_slow_requests_ms is None else profile_slow_requests_ms
+    profiler = (SlowRequestProfiler(threshold, PROFILE_SAMPLE_INTERVAL_MS, PROFILES_DIR)
+                if threshold > 0 else None)
+
+    @app.before_request
+    def _start_timer():
+        _request_state.route = request.url_rule.rule if request.url_rule else "unmatched"
+        _request_state.start = time.perf_counter()
+        if profiler is not None:
+            profiler.begin()
+
+    def _finish_request(status: int):
+        start = getattr(_request_state, "start", None)
+        if start is not None:
+            elapsed = time.perf_counter() - start
+            route = _current_route()
+            registry.observe("http_request_duration_seconds", elapsed,
+                             {"route": route, "method": request.method})
+            registry.inc("http_requests_total",
+                         {"route": route, "method": request.method, "status": status})
+            if profiler is not None:
+                profiler.end(route, elapsed)
+        _request_state.route = None
+        _request_state.start = None
+        _request_state.status = None
+
+    @app.after_request
+    def _record_status(response):
+        _request_state.status = response.status_code
+        # Streams (SSE) are timed to their first byte, not for as long as they stay open
+        if response.is_streamed:
+            _finish_request(response.status_code)
+        return response
+
+    # Teardown runs even when a view raises, so per-request state never leaks
+    @app.teardown_request
+    def _record_request(exc):
+        status = getattr(_request_state, "status", None)
+        _finish_request(500 if exc is not None or status is None else status)
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus metrics endpoint."""
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    return app
@@ -0,0 +1,49 @@
+"""Deferred construction of components that pull in heavy dependencies."""
+
+import importlib
+import threading
+from typing import Any
+
+
+class LazyComponent:
+    """
+    Proxy that imports and instantiates a class on first attribute access.
+
+    Lets module-level singletons such as the predictors be declared at import
+    time without importing pandas, scikit-learn or Prophet until a request
+    actually uses them.
+    """
+
+    def __init__(self, module_name: str, class_name: str):
+        self._module_name = module_name
+        self._class_name = class_name
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        """Return the underlying instance, creating it if needed."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_name)
+                    self._instance = getattr(module, self._class_name)()
+        return self._instance
+
+    def release(self):
+        """Drop the instance and whatever it caches; the next use creates a new one."""
+        with self._lock:
+            self._instance = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the proxy itself
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyComponent {self._module_name}.{self._class_name} ({state})>"
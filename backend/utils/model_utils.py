@@ -1,18 +1,21 @@
 """Utility functions for model training and evaluation."""
 
 import numpy as np
-from typing import Dict, Any
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from typing import Dict, Any, Hashable, Optional, Tuple
+from functools import lru_cache
+from statistics import NormalDist
 import math
 
 
 def calculate_rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """Calculate Root Mean Squared Error."""
+    from sklearn.metrics import mean_squared_error
     return math.sqrt(mean_squared_error(y_true, y_pred))
 
 
 def calculate_mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """Calculate Mean Absolute Error."""
+    from sklearn.metrics import mean_absolute_error
     return mean_absolute_error(y_true, y_pred)
 
 
@@ -26,19 +29,173 @@ def calculate_mape(y_true: np.ndarray, y_pred: np.ndarray) -> float:
 
 def calculate_r2(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """Calculate R-squared score."""
+    from sklearn.metrics import r2_score
     return r2_score(y_true, y_pred)
 
 
 def get_regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
-    """Calculate all regression metrics."""
+    """Calculate all regression metrics in a single pass over the arrays."""
+    y_true, y_pred = _as_float_pair(y_true, y_pred)
+    if len(y_true) == 0:
+        raise ValueError("Cannot compute regression metrics of an empty sample")
+    group_ids = np.zeros(len(y_true), dtype=np.intp)
+    metrics = _metrics_from_sums(**_grouped_sums(y_true, y_pred, group_ids, 1))
+    return {name: float(values[0]) for name, values in metrics.items()}
+
+
+def grouped_regression_metrics(y_true: np.ndarray, y_pred: np.ndarray,
+                               group_ids: np.ndarray,
+                               n_groups: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Calculate regression metrics for many groups in one vectorized call.
+    
+    Args:
+        y_true: Concatenated actual values of all groups
+        y_pred: Concatenated predictions, aligned with ``y_true``
+        group_ids: Integer group id (0..n_groups-1) of every row
+        n_groups: Number of groups (default: ``group_ids.max() + 1``)
+    
+    Returns:
+        Dictionary of per-group ``n``, ``rmse``, ``mae``, ``mape`` and ``r2`` arrays
+    """
+    y_true, y_pred = _as_float_pair(y_true, y_pred)
+    group_ids = np.asarray(group_ids, dtype=np.intp).ravel()
+    if len(group_ids) != len(y_true):
+        raise ValueError("group_ids must have one entry per row")
+    if n_groups is None:
+        n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+    
+    sums = _grouped_sums(y_true, y_pred, group_ids, n_groups)
+    metrics = _metrics_from_sums(**sums)
+    metrics["n"] = sums["n"].astype(np.int64)
+    return metrics
+
+
+def get_grouped_regression_metrics(
+        results: Dict[Hashable, Tuple[np.ndarray, np.ndarray]]) -> Dict[Hashable, Dict[str, float]]:
+    """
+    Calculate regression metrics for every key of ``{key: (y_true, y_pred)}``.
+    
+    Equivalent to calling ``get_regression_metrics`` per key, but evaluates all
+    keys (e.g. every (locality, network_type) model) in one vectorized call.
+    """
+    keys = list(results)
+    if not keys:
+        return {}
+    
+    y_true = np.concatenate([np.asarray(results[key][0], dtype=np.float64).ravel() for key in keys])
+    y_pred = np.concatenate([np.asarray(results[key][1], dtype=np.float64).ravel() for key in keys])
+    lengths = [len(np.asarray(results[key][0]).ravel()) for key in keys]
+    if not all(lengths):
+        raise ValueError("Cannot compute regression metrics of an empty sample")
+    group_ids = np.repeat(np.arange(len(keys)), lengths)
+    
+    metrics = grouped_regression_metrics(y_true, y_pred, group_ids, len(keys))
     return {
-        "rmse": calculate_rmse(y_true, y_pred),
-        "mae": calculate_mae(y_true, y_pred),
-        "mape": calculate_mape(y_true, y_pred),
-        "r2": calculate_r2(y_true, y_pred),
+        key: {name: float(metrics[name][i]) for name in ("rmse", "mae", "mape", "r2")}
+        for i, key in enumerate(keys)
     }
 
 
+def bootstrap_metric_intervals(y_true: np.ndarray, y_pred: np.ndarray,
+                               n_bootstrap: int = 1000, confidence: float = 0.95,
+                               seed: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Bootstrap confidence intervals for the regression metrics.
+    
+    Resamples are drawn as multinomial row weights, so every replicate's
+    metrics come from a matrix product rather than a Python loop.
+    
+    Args:
+        y_true: Actual values
+        y_pred: Predicted values
+        n_bootstrap: Number of bootstrap replicates
+        confidence: Confidence level (default 0.95)
+        seed: Random seed
+    
+    Returns:
+        Dictionary mapping each metric to its ``lower`` and ``upper`` bound
+    """
+    y_true, y_pred = _as_float_pair(y_true, y_pred)
+    n = len(y_true)
+    if n == 0:
+        raise ValueError("Cannot bootstrap an empty sample")
+    
+    rng = np.random.default_rng(seed)
+    columns = _row_statistics(y_true, y_pred, y_true[0])
+    
+    # Bound the (replicates x rows) weight matrix to ~8M entries per batch
+    batch = max(1, min(n_bootstrap, 8_000_000 // n))
+    replicates = {name: [] for name in ("rmse", "mae", "mape", "r2")}
+    for start in range(0, n_bootstrap, batch):
+        size = min(batch, n_bootstrap - start)
+        weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size).astype(np.float64)
+        sums = {name: weights @ column for name, column in columns.items()}
+        sums["n"] = np.full(size, float(n))
+        for name, values in _metrics_from_sums(**sums).items():
+            replicates[name].append(values)
+    
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name, chunks in replicates.items():
+        values = np.concatenate(chunks)
+        lower, upper = np.nanquantile(values, [alpha, 1 - alpha])
+        intervals[name] = {"lower": float(lower), "upper": float(upper)}
+    return intervals
+
+
+def _as_float_pair(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+    if y_true.shape != y_pred.shape:
+        raise ValueError(f"y_true and y_pred have different lengths: {len(y_true)} != {len(y_pred)}")
+    return y_true, y_pred
+
+
+def _row_statistics(y_true: np.ndarray, y_pred: np.ndarray, shift) -> Dict[str, np.ndarray]:
+    """Per-row terms whose sums determine every metric."""
+    err = y_pred - y_true
+    nonzero = y_true != 0
+    # Shifting y by a value from its own group keeps the variance sums stable
+    centered = y_true - shift
+    return {
+        "sse": err * err,
+        "sae": np.abs(err),
+        "ape": np.divide(np.abs(err), np.abs(y_true), out=np.zeros_like(err), where=nonzero),
+        "ape_n": nonzero.astype(np.float64),
+        "s1": centered,
+        "s2": centered * centered,
+    }
+
+
+def _grouped_sums(y_true: np.ndarray, y_pred: np.ndarray,
+                  group_ids: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    # First row of each group serves as that group's shift
+    first = np.zeros(n_groups, dtype=np.intp)
+    present, first_index = np.unique(group_ids, return_index=True)
+    first[present] = first_index
+    columns = _row_statistics(y_true, y_pred, y_true[first[group_ids]] if len(y_true) else 0.0)
+    
+    sums = {name: np.bincount(group_ids, weights=column, minlength=n_groups)
+            for name, column in columns.items()}
+    sums["n"] = np.bincount(group_ids, minlength=n_groups).astype(np.float64)
+    return sums
+
+
+def _metrics_from_sums(n, sse, sae, ape, ape_n, s1, s2) -> Dict[str, np.ndarray]:
+    """Turn per-group sums into RMSE, MAE, MAPE and R² (sklearn conventions)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rmse = np.sqrt(sse / n)
+        mae = sae / n
+        mape = np.where(ape_n > 0, ape / ape_n * 100, 0.0)
+        sst = s2 - s1 * s1 / n
+        sst = np.where(sst < 1e-12 * np.maximum(s2, 1.0), 0.0, sst)
+        # Constant targets score 1.0 when predicted exactly, 0.0 otherwise
+        r2 = np.where(sst > 0, 1 - sse / sst, np.where(sse == 0, 1.0, 0.0))
+        r2 = np.where(n < 2, np.nan, r2)
+    return {"rmse": rmse, "mae": mae, "mape": mape, "r2": r2}
+
+
 def get_classification_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, Any]:
     """Calculate classification metrics."""
     from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
@@ -52,6 +209,12 @@ def get_classification_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[s
     }
 
 
+@lru_cache(maxsize=32)
+def normal_quantile(p: float) -> float:
+    """Standard normal quantile (inverse CDF), cached per probability."""
+    return NormalDist().inv_cdf(p)
+
+
 def calculate_confidence_interval(predictions: np.ndarray, std: np.ndarray, confidence: float = 0.95) -> Dict[str, np.ndarray]:
     """
     Calculate confidence intervals for predictions.
@@ -64,9 +227,7 @@ def calculate_confidence_interval(predictions: np.ndarray, std: np.ndarray, conf
     Returns:
         Dictionary with upper and lower bounds
     """
-    from scipy import stats
-    
-    z_score = stats.norm.ppf((1 + confidence) / 2)
+    z_score = normal_quantile((1 + confidence) / 2)
     margin = z_score * std
     
     return {
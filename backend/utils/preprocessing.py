@@ -5,13 +5,16 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Tuple, Optional
 import pickle
+import os
 from pathlib import Path
+from urllib.parse import unquote
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import DATA_DIR, MODELS_DIR
+from config import (DATA_DIR, MODELS_DIR, DATASET_NAME, PREPROCESS_CHUNK_ROWS,
+                    PREPROCESS_MEMORY_LIMIT_MB, PARTITIONS_DIR)
 
 
 class DataPreprocessor:
@@ -25,27 +28,47 @@ class DataPreprocessor:
         """
         Load dataset from Kaggle using kagglehub.
         
+        Args:
+            dataset_path: Local CSV file or directory to use instead of downloading
+        
         Returns:
             pd.DataFrame: Loaded and basic cleaned dataset
         """
-        import kagglehub
-        
-        # Download latest version
-        path = kagglehub.dataset_download("suraj520/cellular-network-analysis-dataset")
-        print(f"Path to dataset files: {path}")
-        
-        # Find CSV file in the dataset
-        csv_files = list(Path(path).glob("*.csv"))
-        if not csv_files:
-            raise FileNotFoundError(f"No CSV file found in dataset path: {path}")
-        
         # Load the first CSV file
-        df = pd.read_csv(csv_files[0])
+        df = pd.read_csv(self._find_dataset_csv(dataset_path))
         print(f"Loaded dataset with shape: {df.shape}")
         print(f"Columns: {df.columns.tolist()}")
         
         return df
     
+    def _find_dataset_csv(self, dataset_path: Optional[Path] = None) -> Path:
+        """
+        Locate the dataset CSV, downloading it from Kaggle if no path is given.
+        
+        Args:
+            dataset_path: CSV file or directory containing one
+            
+        Returns:
+            Path: Path to the CSV file
+        """
+        if dataset_path is None:
+            import kagglehub
+            
+            # Download latest version
+            dataset_path = kagglehub.dataset_download(DATASET_NAME)
+            print(f"Path to dataset files: {dataset_path}")
+        
+        dataset_path = Path(dataset_path)
+        if dataset_path.is_file():
+            return dataset_path
+        
+        # Find CSV file in the dataset
+        csv_files = sorted(dataset_path.glob("*.csv"))
+        if not csv_files:
+            raise FileNotFoundError(f"No CSV file found in dataset path: {dataset_path}")
+        
+        return csv_files[0]
+    
     def preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Preprocess the dataset: clean, engineer features, handle missing values.
@@ -57,17 +80,7 @@ class DataPreprocessor:
             pd.DataFrame: Preprocessed dataset
         """
         df = df.copy()
-        
-        # Parse timestamps
-        if 'Timestamp' in df.columns:
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-        elif 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            df['Timestamp'] = df['timestamp']
-        
-        # Remove Signal Quality column (all 0.0 as specified)
-        columns_to_remove = [col for col in df.columns if 'Signal Quality' in col or 'signal_quality' in col.lower()]
-        df = df.drop(columns=columns_to_remove, errors='ignore')
+        df = self._clean_raw(df)
         
         # Handle missing values - forward fill for time-series
         df = df.sort_values('Timestamp')
@@ -79,6 +92,23 @@ class DataPreprocessor:
             # For pandas >= 2.0
             df[numeric_columns] = df[numeric_columns].ffill().bfill()
         
+        return self._engineer_features(df)
+    
+    def _clean_raw(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Parse timestamps and drop the unused Signal Quality column."""
+        # Parse timestamps
+        if 'Timestamp' in df.columns:
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+        elif 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+            df['Timestamp'] = df['timestamp']
+        
+        # Remove Signal Quality column (all 0.0 as specified)
+        columns_to_remove = [col for col in df.columns if 'Signal Quality' in col or 'signal_quality' in col.lower()]
+        return df.drop(columns=columns_to_remove, errors='ignore')
+    
+    def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Standardize column names and add temporal and locality features."""
         # Standardize column names (handle case variations)
         column_mapping = {}
         for col in df.columns:
@@ -144,6 +174,141 @@ class DataPreprocessor:
         
         return df
     
+    def preprocess_chunked(self, dataset_path: Optional[Path] = None,
+                           output_dir: Optional[Path] = None,
+                           chunk_size: int = PREPROCESS_CHUNK_ROWS,
+                           memory_limit_mb: float = PREPROCESS_MEMORY_LIMIT_MB) -> Path:
+        """
+        Preprocess a CSV too large for memory into Locality-partitioned Parquet files.
+        
+        The CSV is streamed in bounded chunks. Forward-fill state (the last valid
+        value of every numeric column) is carried from one chunk to the next, so
+        the result matches ``preprocess`` for exports that are already in
+        timestamp order. Each chunk gets the column mapping and temporal features
+        and is appended to ``<output_dir>/Locality=<name>/``.
+        
+        Peak RSS is checked after every chunk: the chunk size is halved while it
+        exceeds ``memory_limit_mb`` and grows back once there is headroom.
+        
+        Args:
+            dataset_path: CSV file or directory (default: download from Kaggle)
+            output_dir: Partition root (default: PARTITIONS_DIR); replaced if it exists
+            chunk_size: Initial number of rows per chunk
+            memory_limit_mb: Ceiling on resident memory in MB
+            
+        Returns:
+            Path: The partition root directory
+        """
+        import shutil
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        csv_path = self._find_dataset_csv(dataset_path)
+        output_dir = Path(output_dir or PARTITIONS_DIR)
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        output_dir.mkdir(parents=True)
+        
+        min_chunk_size = min(chunk_size, 1000)
+        max_chunk_size = chunk_size
+        last_values = None
+        total_rows = 0
+        part = 0
+        
+        reader = pd.read_csv(csv_path, iterator=True)
+        try:
+            while True:
+                try:
+                    chunk = reader.get_chunk(chunk_size)
+                except StopIteration:
+                    break
+                
+                chunk = self._clean_raw(chunk).sort_values('Timestamp', kind='stable')
+                numeric_columns = chunk.select_dtypes(include=[np.number]).columns
+                filled = chunk[numeric_columns].ffill()
+                if last_values is not None:
+                    filled = filled.fillna(last_values)
+                    last_values = filled.iloc[-1].fillna(last_values)
+                else:
+                    last_values = filled.iloc[-1]
+                # Only rows before the first valid value in the file are left
+                chunk[numeric_columns] = filled.bfill()
+                
+                chunk = self._engineer_features(chunk)
+                chunk['Locality'] = chunk['Locality'].astype(str)
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                pq.write_to_dataset(table, output_dir, partition_cols=['Locality'],
+                                    basename_template=f"part-{part:05d}-{{i}}.parquet")
+                total_rows += len(chunk)
+                part += 1
+                del chunk, filled, table
+                
+                rss_mb = _current_rss_mb()
+                if rss_mb > memory_limit_mb:
+                    if chunk_size <= min_chunk_size:
+                        raise MemoryError(
+                            f"RSS {rss_mb:.0f}MB exceeds the {memory_limit_mb:.0f}MB limit "
+                            f"even with {chunk_size}-row chunks")
+                    chunk_size = max(min_chunk_size, chunk_size // 2)
+                    print(f"RSS {rss_mb:.0f}MB over limit, reducing chunk size to {chunk_size}")
+                elif rss_mb < memory_limit_mb / 2 and chunk_size < max_chunk_size:
+                    chunk_size = min(max_chunk_size, chunk_size * 2)
+        finally:
+            reader.close()
+        
+        print(f"Preprocessed {total_rows} rows in {part} chunks into {output_dir}")
+        return output_dir
+    
+    def partition_localities(self, partition_dir: Optional[Path] = None) -> list:
+        """
+        List the localities that have a partition, in partition order.
+        
+        Returns an empty list when ``preprocess_chunked`` has not been run.
+        """
+        partition_dir = Path(partition_dir or PARTITIONS_DIR)
+        if not partition_dir.exists():
+            return []
+        return [unquote(path.name.split('=', 1)[1]) for path in sorted(partition_dir.glob('Locality=*'))]
+    
+    def load_partitions(self, partition_dir: Optional[Path] = None,
+                        localities: Optional[list] = None,
+                        columns: Optional[list] = None) -> pd.DataFrame:
+        """
+        Load preprocessed partitions, reading only the requested localities and columns.
+        
+        Args:
+            partition_dir: Partition root written by ``preprocess_chunked``
+            localities: Localities to load (default: all)
+            columns: Columns to load (default: all)
+            
+        Returns:
+            pd.DataFrame: Preprocessed rows in timestamp order
+        """
+        partition_dir = Path(partition_dir or PARTITIONS_DIR)
+        filters = [('Locality', 'in', list(localities))] if localities else None
+        if columns is not None and 'Timestamp' not in columns:
+            columns = list(columns) + ['Timestamp']
+        
+        df = pd.read_parquet(partition_dir, columns=columns, filters=filters)
+        if 'Locality' in df.columns:
+            df['Locality'] = df['Locality'].astype(str)
+        return df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    
+    def iter_partitions(self, partition_dir: Optional[Path] = None,
+                        columns: Optional[list] = None):
+        """
+        Yield ``(locality, DataFrame)`` pairs one partition at a time.
+        
+        Lets per-locality models and analyzers work through the whole dataset
+        while holding a single locality in memory.
+        """
+        partition_dir = Path(partition_dir or PARTITIONS_DIR)
+        for path in sorted(partition_dir.glob('Locality=*')):
+            locality = unquote(path.name.split('=', 1)[1])
+            df = pd.read_parquet(path, columns=columns)
+            df['Locality'] = locality
+            yield locality, df.sort_values('Timestamp', kind='stable').reset_index(drop=True)
+    
     def train_test_split(self, df: pd.DataFrame, test_size: float = 0.2) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Split data into train and test sets maintaining temporal order.
@@ -201,3 +366,15 @@ class DataPreprocessor:
         else:
             print("No preprocessor found. Will create new one.")
 
+
+def _current_rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to the peak RSS (KB on Linux, bytes on macOS)
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
@@ -0,0 +1,202 @@
+"""Fast JSON responses: NumPy/pandas-aware serialization, columnar payloads,
+compression and version-based conditional GETs."""
+
+import functools
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import RESPONSE_COMPRESSION_MIN_BYTES
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+# Changes on restart, so ETags from a previous process never validate
+_INSTANCE_TOKEN = uuid.uuid4().hex
+
+_versions: Dict[str, int] = {'dataset': 0, 'models': 0}
+_versions_lock = threading.Lock()
+_version_sources: Dict[str, Callable[[], int]] = {}
+
+
+def bump_version(scope: str) -> int:
+    """Mark ``scope`` (``'dataset'`` or ``'models'``) as changed, invalidating its ETags."""
+    with _versions_lock:
+        _versions[scope] = _versions.get(scope, 0) + 1
+        return _versions[scope]
+
+
+def set_version_source(scope: str, source: Callable[[], int]):
+    """Read ``scope``'s version from ``source`` (e.g. the dataset snapshot store) instead of a counter."""
+    _version_sources[scope] = source
+
+
+def get_version(scope: str) -> int:
+    if scope in _version_sources:
+        return _version_sources[scope]()
+    return _versions.get(scope, 0)
+
+
+def _default(obj: Any) -> Any:
+    """Convert NumPy/pandas/datetime values the JSON encoder can't handle."""
+    import numpy as np
+    import pandas as pd
+
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Serialize ``payload`` to JSON bytes.
+
+    Uses orjson when installed (NumPy arrays and scalars are encoded natively,
+    NaN becomes null), otherwise the standard library encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def to_columnar(payload: Any) -> Any:
+    """
+    Rewrite arrays of objects as objects of parallel arrays.
+
+    ``[{'a': 1, 'b': 2}, {'a': 3, 'b': 4}]`` becomes ``{'a': [1, 3], 'b': [2, 4]}``,
+    recursively, so nested records (e.g. ``coordinates``) become nested
+    columns too. Lists whose items don't share the same keys are left as-is.
+    """
+    if isinstance(payload, dict):
+        return {key: to_columnar(value) for key, value in payload.items()}
+    if isinstance(payload, list) and payload and isinstance(payload[0], dict):
+        keys = list(payload[0])
+        if all(isinstance(item, dict) and list(item) == keys for item in payload):
+            return {key: to_columnar([item[key] for item in payload]) for key in keys}
+    return payload
+
+
+def json_response(payload: Any, status: int = 200):
+    """
+    Build a JSON response, in columnar form when the request has ``?format=columnar``.
+
+    Args:
+        payload: Dicts/lists possibly containing NumPy or pandas values
+        status: HTTP status code
+
+    Returns:
+        flask.Response
+    """
+    from flask import Response, request
+
+    if request.args.get('format') == 'columnar':
+        payload = to_columnar(payload)
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def _compute_etag(scopes) -> str:
+    from flask import request
+
+    parts = [_INSTANCE_TOKEN, request.full_path]
+    parts.extend(f"{scope}={get_version(scope)}" for scope in scopes)
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def conditional(*scopes: str):
+    """
+    Decorator adding an ETag tied to the given data versions to a GET endpoint.
+
+    The ETag is checked before the view runs, so a matching ``If-None-Match``
+    returns ``304 Not Modified`` without recomputing the payload.
+
+    Args:
+        scopes: Version scopes the response depends on (``'dataset'``, ``'models'``)
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import Response, make_response, request
+
+            etag = _compute_etag(scopes)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def _compress(response, min_bytes: int):
+    from flask import request
+
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+    if brotli is not None and request.accept_encodings['br']:
+        response.set_data(brotli.compress(body, quality=5))
+        response.headers['Content-Encoding'] = 'br'
+    elif request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def init_app(app, compression_min_bytes: Optional[int] = None):
+    """
+    Enable response compression for JSON responses of a Flask app.
+
+    Args:
+        app: Flask application
+        compression_min_bytes: Smallest body worth compressing; defaults to
+            ``RESPONSE_COMPRESSION_MIN_BYTES`` (0 disables compression)
+    """
+    min_bytes = RESPONSE_COMPRESSION_MIN_BYTES if compression_min_bytes is None else compression_min_bytes
+    if min_bytes <= 0:
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        return _compress(response, min_bytes)
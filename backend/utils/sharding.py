@@ -0,0 +1,424 @@
+"""Locality sharding: shard assignment, shard-local data and exact merging of partial results."""
+
+import math
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DEMAND_WEIGHTS, PARTITIONS_DIR, PREPROCESS_CHUNK_ROWS
+
+SUMMARY_COLUMNS = ['Signal_Strength', 'Data_Throughput', 'Latency']
+
+# ``metric`` query values of the analysis endpoints and the columns they read
+METRIC_COLUMNS = {
+    'throughput': 'Data_Throughput',
+    'signal_strength': 'Signal_Strength',
+    'latency': 'Latency',
+}
+
+# Days of data covered by each location-demand ``time_range`` (None: all data)
+TIME_RANGE_DAYS = {'current': None, 'week': 7, 'month': 30}
+
+
+def shard_for(locality: str, shard_count: int) -> int:
+    """Shard owning ``locality`` (stable across processes and restarts, unlike ``hash``)."""
+    return zlib.crc32(str(locality).encode('utf-8')) % shard_count
+
+
+def owned_localities(localities: Iterable[str], shard_index: int, shard_count: int) -> List[str]:
+    return [loc for loc in localities if shard_for(loc, shard_count) == shard_index]
+
+
+def load_shard_data(shard_index: int, shard_count: int, dataset_path=None):
+    """
+    Load and preprocess only this shard's localities.
+
+    Reads just the owned Locality partitions when the dataset has been
+    partitioned (see ``DataPreprocessor.preprocess_chunked``). Otherwise the
+    CSV is streamed in ``PREPROCESS_CHUNK_ROWS`` chunks and only owned rows
+    are kept, so the full dataset is never held in memory; missing values
+    are then forward-filled within the shard's rows rather than across
+    the whole dataset.
+    """
+    import pandas as pd
+    from utils.preprocessing import DataPreprocessor
+
+    preprocessor = DataPreprocessor()
+    localities = preprocessor.partition_localities(PARTITIONS_DIR)
+    if localities:
+        owned = owned_localities(localities, shard_index, shard_count)
+        print(f"Shard {shard_index}/{shard_count}: loading {len(owned)} of {len(localities)} locality partitions")
+        if not owned:
+            # No filter means every locality to load_partitions; keep the columns, drop the rows
+            return preprocessor.load_partitions(PARTITIONS_DIR, localities=localities[:1]).iloc[:0]
+        return preprocessor.load_partitions(PARTITIONS_DIR, localities=owned)
+
+    csv_path = preprocessor._find_dataset_csv(dataset_path)
+    kept, total_rows = [], 0
+    for chunk in pd.read_csv(csv_path, chunksize=PREPROCESS_CHUNK_ROWS):
+        column = next((col for col in chunk.columns
+                       if 'locality' in col.lower() or 'location' in col.lower()), None)
+        if column is None:
+            raise ValueError("Sharded mode needs a Locality column in the dataset")
+        names = chunk[column].astype(str)
+        owner = names.map({name: shard_for(name, shard_count) for name in names.unique()})
+        kept.append(chunk[owner == shard_index])
+        total_rows += len(chunk)
+    df = pd.concat(kept, ignore_index=True)
+    print(f"Shard {shard_index}/{shard_count}: keeping {len(df)} of {total_rows} rows")
+    return preprocessor.preprocess(df)
+
+
+def _chan_merge(a: List[float], b: List[float]) -> List[float]:
+    """Combine two (count, mean, M2) triples."""
+    n = a[0] + b[0]
+    if not n:
+        return [0, 0.0, 0.0]
+    delta = b[1] - a[1]
+    return [n, a[1] + delta * b[0] / n, a[2] + b[2] + delta ** 2 * a[0] * b[0] / n]
+
+
+def summary_partials(df) -> Dict[str, Any]:
+    """
+    Mergeable pieces of ``/api/data/summary`` for one shard.
+
+    Numeric columns are reduced to (count, mean, M2, min, max), which combine
+    exactly across shards with Chan's parallel variance update.
+    """
+    partials = {
+        'total_records': len(df),
+        'localities': df['Locality'].dropna().astype(str).unique().tolist() if 'Locality' in df.columns else [],
+        'network_types': df['Network_Type'].dropna().astype(str).unique().tolist() if 'Network_Type' in df.columns else [],
+        'date_range': {
+            'start': df['Timestamp'].min().isoformat() if 'Timestamp' in df.columns and len(df) else None,
+            'end': df['Timestamp'].max().isoformat() if 'Timestamp' in df.columns and len(df) else None,
+        },
+        'columns': {},
+    }
+    for col in SUMMARY_COLUMNS:
+        if col in df.columns:
+            values = df[col].dropna()
+            mean = float(values.mean()) if len(values) else 0.0
+            partials['columns'][col] = {
+                'count': int(len(values)),
+                'mean': mean,
+                'm2': float(((values - mean) ** 2).sum()),
+                'min': float(values.min()) if len(values) else None,
+                'max': float(values.max()) if len(values) else None,
+            }
+    return partials
+
+
+def merge_summary_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine shard partials into the ``/api/data/summary`` response."""
+    starts = [p['date_range']['start'] for p in partials if p['date_range']['start']]
+    ends = [p['date_range']['end'] for p in partials if p['date_range']['end']]
+    summary = {
+        'total_records': sum(p['total_records'] for p in partials),
+        'localities': len(set().union(*(p['localities'] for p in partials))),
+        'network_types': len(set().union(*(p['network_types'] for p in partials))),
+        'date_range': {
+            # ISO-8601 strings of the same format order chronologically
+            'start': min(starts) if starts else None,
+            'end': max(ends) if ends else None,
+        },
+    }
+
+    for col in SUMMARY_COLUMNS:
+        parts = [p['columns'][col] for p in partials if col in p['columns'] and p['columns'][col]['count']]
+        if not parts:
+            continue
+        count, mean, m2 = 0, 0.0, 0.0
+        for part in parts:
+            count, mean, m2 = _chan_merge([count, mean, m2], [part['count'], part['mean'], part['m2']])
+        summary[col.lower()] = {
+            'mean': mean,
+            # Sample standard deviation, as pandas' Series.std
+            'std': math.sqrt(m2 / (count - 1)) if count > 1 else float('nan'),
+            'min': min(part['min'] for part in parts),
+            'max': max(part['max'] for part in parts),
+        }
+    return summary
+
+
+def merge_localities(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    localities = sorted((loc for r in results for loc in r.get('localities', [])), key=lambda loc: loc['name'])
+    return {'localities': localities, 'total': len(localities)}
+
+
+def merge_network_types(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    network_types = sorted(set().union(*(r.get('network_types', []) for r in results)))
+    return {'network_types': network_types, 'total': len(network_types)}
+
+
+def _merge_shared_keys(merged: Dict[str, Any], results: List[Dict[str, Any]], endpoint: str):
+    """
+    Copy keys the explicit merge does not know, when every shard agrees on them.
+
+    Values that differ between shards cannot be merged without knowing what
+    they mean, so they are dropped and logged rather than taken from one shard.
+    """
+    keys = {key for r in results for key in r if key not in merged}
+    for key in sorted(keys):
+        values = [r.get(key) for r in results]
+        if all(value == values[0] for value in values[1:]):
+            merged[key] = values[0]
+        else:
+            print(f"Warning: dropping '{key}' from merged {endpoint}: shards disagree and it has no merge rule")
+
+
+def merge_network_usage(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum usage counts and trend counts per network type across shards."""
+    counts: Dict[str, int] = {}
+    for r in results:
+        for network_type, stats in r.get('usage_stats', {}).items():
+            counts[network_type] = counts.get(network_type, 0) + stats.get('count', 0)
+    total = sum(counts.values())
+    usage_stats = {
+        network_type: {'count': count, 'percentage': count / total * 100 if total else 0.0}
+        for network_type, count in counts.items()
+    }
+
+    by_type: Dict[str, Dict[str, float]] = {}
+    for r in results:
+        for trend in r.get('trends', []):
+            series = by_type.setdefault(trend['network_type'], {})
+            for date, count in zip(trend['dates'], trend['counts']):
+                series[date] = series.get(date, 0) + count
+    trends = [{'network_type': network_type, 'dates': sorted(series), 'counts': [series[d] for d in sorted(series)]}
+              for network_type, series in by_type.items()]
+
+    merged = {
+        'usage_stats': usage_stats,
+        'dominant_network': max(counts, key=counts.get) if counts else None,
+        'trends': trends,
+    }
+    _merge_shared_keys(merged, results, 'network usage')
+    return merged
+
+
+def merge_model_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-locality model metrics are disjoint across shards, so merge the dicts."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        for section, models in r.items():
+            merged.setdefault(section, {}).update(models)
+    return merged
+
+
+def time_pattern_partials(df, metric: str) -> Dict[str, Any]:
+    """
+    Mergeable pieces of ``/api/analysis/time-patterns`` for one shard.
+
+    The sum and count of the metric for every (hour of day, day of week)
+    cell; hourly, daily and heatmap averages all follow exactly from them.
+    """
+    if metric not in METRIC_COLUMNS:
+        raise ValueError(f"Unknown metric '{metric}'; expected one of {', '.join(METRIC_COLUMNS)}")
+    column = METRIC_COLUMNS[metric]
+    if column not in df.columns:
+        raise ValueError(f"Dataset has no {column} column for metric '{metric}'")
+    values = df[['hour_of_day', 'day_of_week', column]].dropna()
+    cells = values.groupby(['hour_of_day', 'day_of_week'])[column].agg(['sum', 'count'])
+    return {
+        'metric': metric,
+        'cells': [[int(hour), int(day), float(total), int(count)]
+                  for (hour, day), total, count in zip(cells.index, cells['sum'], cells['count'])],
+    }
+
+
+def _merge_cells(partials: List[Dict[str, Any]]) -> Dict[tuple, List[float]]:
+    """Sum and count per (hour, day) cell over all shards."""
+    cells: Dict[tuple, List[float]] = {}
+    for partial in partials:
+        for hour, day, total, count in partial['cells']:
+            cell = cells.setdefault((hour, day), [0.0, 0])
+            cell[0] += total
+            cell[1] += count
+    return dict(sorted(cells.items()))
+
+
+def time_pattern_frame(cells: Dict[tuple, List[float]], metric: str):
+    """
+    Stand-in measurements with the same per-cell sums and counts as the shards.
+
+    Every cell contributes ``count`` rows at the cell average, so any mean
+    over hours, days or cells equals the mean over the real measurements.
+    Timestamps fall in the week of Monday 2024-01-01 at the cell's hour and day.
+    """
+    import numpy as np
+    import pandas as pd
+
+    keys = list(cells)
+    counts = np.array([cells[key][1] for key in keys], dtype=np.int64)
+    hours = np.repeat(np.array([key[0] for key in keys], dtype=np.int64), counts)
+    days = np.repeat(np.array([key[1] for key in keys], dtype=np.int64), counts)
+    values = np.repeat(np.array([cells[key][0] / cells[key][1] for key in keys]), counts)
+    timestamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(days * 24 + hours, unit='h')
+    return pd.DataFrame({
+        'Timestamp': timestamps,
+        'hour_of_day': hours,
+        'day_of_week': days,
+        METRIC_COLUMNS[metric]: values,
+    })
+
+
+def merge_time_pattern_partials(partials: List[Dict[str, Any]], metric: str, analyzer) -> Dict[str, Any]:
+    """
+    Time patterns over all shards.
+
+    Hourly, daily and heatmap averages are computed exactly from the cell
+    sums and counts. Peak hours and demand clusters come from ``analyzer``
+    (the ``TimePatternAnalyzer`` the single-process endpoint uses), run on
+    ``time_pattern_frame``, whose hour, day and cell means equal the real
+    ones. The stand-in frame has one small row per measurement.
+
+    Args:
+        partials: ``time_pattern_partials`` of every shard
+        metric: One of ``METRIC_COLUMNS``
+        analyzer: Object with ``analyze(df, locality=None, metric=...)``
+    """
+    if metric not in METRIC_COLUMNS:
+        raise ValueError(f"Unknown metric '{metric}'; expected one of {', '.join(METRIC_COLUMNS)}")
+    cells = _merge_cells(partials)
+
+    def averages(position: int) -> Dict[int, float]:
+        grouped: Dict[int, List[float]] = {}
+        for key, (total, count) in cells.items():
+            entry = grouped.setdefault(key[position], [0.0, 0])
+            entry[0] += total
+            entry[1] += count
+        return {key: total / count for key, (total, count) in sorted(grouped.items())}
+
+    result = {'peak_hours': [], 'demand_clusters': {}}
+    if cells:
+        result.update(analyzer.analyze(time_pattern_frame(cells, metric), locality=None, metric=metric))
+    result.update({
+        'hourly_averages': averages(0),
+        'daily_patterns': averages(1),
+        'heatmap': [{'hour': hour, 'day': day, 'value': total / count}
+                    for (hour, day), (total, count) in cells.items()],
+    })
+    return result
+
+
+def location_statistics_partials(df) -> Dict[str, Any]:
+    """
+    Per-locality, per-day statistics for location demand on one shard.
+
+    Each row is (locality, day, rows, latitude sum, longitude sum) plus
+    (count, mean, M2) for every metric. Days let the router apply a
+    ``time_range`` relative to the newest timestamp across all shards.
+    """
+    columns = [col for col in SUMMARY_COLUMNS if col in df.columns]
+    frame = df[['Locality', 'Latitude', 'Longitude'] + columns].assign(
+        Locality=df['Locality'].astype(str), day=df['Timestamp'].dt.normalize())
+    grouped = frame.groupby(['Locality', 'day'], sort=True)
+    sums = grouped[['Latitude', 'Longitude'] + columns].sum()
+    counts = grouped[columns].count()
+    means = grouped[columns].mean()
+    m2 = grouped[columns].var(ddof=0) * counts
+    sizes = grouped.size()
+
+    stats = {col: list(zip(counts[col].tolist(), means[col].fillna(0.0).tolist(), m2[col].fillna(0.0).tolist()))
+             for col in columns}
+    rows = [
+        [locality, day.strftime('%Y-%m-%d'), size, lat, lon, {col: list(stats[col][i]) for col in columns}]
+        for i, ((locality, day), size, lat, lon) in enumerate(zip(
+            sums.index, sizes.tolist(), sums['Latitude'].tolist(), sums['Longitude'].tolist()))
+    ]
+    return {'columns': columns, 'rows': rows}
+
+
+def location_demand(partials: List[Dict[str, Any]], metric: str = 'composite',
+                    time_range: str = 'current') -> Dict[str, Any]:
+    """
+    Rank localities by demand from the statistics of every shard.
+
+    Scores are computed once, over all localities together: each metric's
+    per-locality mean is min-max scaled across localities (higher throughput,
+    higher latency and weaker signal mean more demand), and ``demand_score``
+    is 100 times the scaled value of ``metric``, or for ``composite`` the
+    ``DEMAND_WEIGHTS``-weighted average of the scaled metrics. Scaling uses
+    the global minimum and maximum, so a score depends on the other
+    localities and cannot be computed per shard.
+    """
+    if metric != 'composite' and metric not in METRIC_COLUMNS:
+        raise ValueError(f"Unknown metric '{metric}'")
+    if time_range not in TIME_RANGE_DAYS:
+        raise ValueError(f"Unknown time_range '{time_range}'; expected one of {', '.join(TIME_RANGE_DAYS)}")
+
+    rows = [row for partial in partials for row in partial['rows']]
+    days = TIME_RANGE_DAYS[time_range]
+    if days is not None and rows:
+        from datetime import date, timedelta
+        latest = max(date.fromisoformat(row[1]) for row in rows)
+        first_day = (latest - timedelta(days=days - 1)).isoformat()
+        rows = [row for row in rows if row[1] >= first_day]
+
+    by_locality: Dict[str, Dict[str, Any]] = {}
+    for locality, _, size, lat_sum, lon_sum, stats in rows:
+        entry = by_locality.setdefault(locality, {'rows': 0, 'lat': 0.0, 'lon': 0.0, 'stats': {}})
+        entry['rows'] += size
+        entry['lat'] += lat_sum
+        entry['lon'] += lon_sum
+        for col, triple in stats.items():
+            entry['stats'][col] = _chan_merge(entry['stats'].get(col, [0, 0.0, 0.0]), triple)
+
+    names = sorted(by_locality)
+    direction = {'Data_Throughput': 1.0, 'Latency': 1.0, 'Signal_Strength': -1.0}
+    scaled: Dict[str, Dict[str, float]] = {name: {} for name in names}
+    for key, col in METRIC_COLUMNS.items():
+        means = {name: by_locality[name]['stats'][col][1] for name in names
+                 if by_locality[name]['stats'].get(col, [0])[0]}
+        if not means:
+            continue
+        low, high = min(means.values()), max(means.values())
+        for name, mean in means.items():
+            value = (mean - low) / (high - low) if high > low else 0.5
+            scaled[name][key] = value if direction[col] > 0 else 1.0 - value
+
+    localities = []
+    for name in names:
+        entry = by_locality[name]
+        weights = {key: DEMAND_WEIGHTS[key] if metric == 'composite' else 1.0
+                   for key in scaled[name] if metric in ('composite', key)}
+        total_weight = sum(weights.values())
+        localities.append({
+            'name': name,
+            'demand_score': 100.0 * sum(weights[key] * scaled[name][key] for key in weights) / total_weight
+            if total_weight else 0.0,
+            'coordinates': {'latitude': entry['lat'] / entry['rows'], 'longitude': entry['lon'] / entry['rows']},
+            'statistics': {
+                key: {'mean': entry['stats'][col][1],
+                      'std': math.sqrt(entry['stats'][col][2] / (entry['stats'][col][0] - 1))
+                      if entry['stats'][col][0] > 1 else 0.0}
+                for key, col in METRIC_COLUMNS.items() if entry['stats'].get(col, [0])[0]
+            },
+            'records': entry['rows'],
+        })
+
+    ranked = sorted(localities, key=lambda loc: loc['demand_score'], reverse=True)
+    ranked = [{**loc, 'rank': i + 1} for i, loc in enumerate(ranked)]
+    result: Dict[str, Any] = {
+        'metric': metric,
+        'time_range': time_range,
+        'ranked_localities': ranked,
+        'top_5_high_demand': ranked[:5],
+        'top_5_low_demand': ranked[::-1][:5],
+    }
+    scores = [loc['demand_score'] for loc in ranked]
+    if scores:
+        mean = sum(scores) / len(scores)
+        result['statistics'] = {
+            'mean': mean,
+            'std': math.sqrt(sum((s - mean) ** 2 for s in scores) / (len(scores) - 1)) if len(scores) > 1 else 0.0,
+            'min': min(scores),
+            'max': max(scores),
+            'total_localities': len(scores),
+        }
+    return result
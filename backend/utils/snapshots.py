@@ -0,0 +1,128 @@
+"""Immutable, versioned dataset snapshots for lock-free concurrent reads."""
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _freeze_array(values):
+    """Mark a block's NumPy buffer read-only, including those inside extension arrays."""
+    if isinstance(values, np.ndarray):
+        values.flags.writeable = False
+        return
+    # Datetime/NumPy-backed string arrays (_ndarray), categoricals (_codes), masked arrays (_data, _mask);
+    # Arrow-backed arrays are immutable already
+    for attr in ('_ndarray', '_codes', '_data', '_mask'):
+        inner = getattr(values, attr, None)
+        if isinstance(inner, np.ndarray):
+            inner.flags.writeable = False
+
+
+def _freeze(df: pd.DataFrame):
+    """Mark every block buffer behind ``df`` and every column array read-only."""
+    for block in df._mgr.blocks:
+        _freeze_array(block.values)
+    for name in df.columns:
+        _freeze_array(df[name].array)
+
+
+class DatasetSnapshot:
+    """
+    One published version of the dataset.
+
+    The snapshot takes ownership of the published frame without copying it
+    and marks every block buffer read-only, so neither the publisher nor a
+    reader can change it in place. ``frame`` hands each reader its own view.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: int):
+        _freeze(df)
+        self._frame = df
+        self.version = version
+        self.created_at = datetime.now()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        The snapshot's data for one reader.
+
+        A shallow view: no data is copied, and readers may add or replace
+        columns on it. With Copy-on-Write (pandas 3) a reader writing into a
+        column gets its own copy of that column; on pandas 2.x such in-place
+        writes raise ``ValueError`` on the read-only buffers.
+        """
+        return self._frame.copy(deep=False)
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def __repr__(self) -> str:
+        return f"<DatasetSnapshot v{self.version}: {len(self._frame)} rows>"
+
+
+class SnapshotStore:
+    """
+    Holds the current ``DatasetSnapshot`` and publishes new ones by reference swap.
+
+    Readers take the current snapshot without locking; a reload builds the
+    next snapshot off to the side and replaces the reference in one
+    assignment. Requests already holding the old snapshot keep reading it,
+    and it is freed when the last of them drops its reference. ``version``
+    increases with every publish and is used for HTTP ETags.
+    """
+
+    def __init__(self):
+        self._current: Optional[DatasetSnapshot] = None
+        self._publish_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        snapshot = self._current
+        return snapshot.version if snapshot is not None else 0
+
+    def current(self) -> Optional[DatasetSnapshot]:
+        """The latest published snapshot, or None before the first publish."""
+        return self._current
+
+    def publish(self, df: pd.DataFrame) -> DatasetSnapshot:
+        """
+        Publish ``df`` as the next snapshot.
+
+        The snapshot takes ownership of ``df`` without copying it: its
+        buffers become read-only, and the caller should drop any cache that
+        still references it so that replaced snapshots can be freed.
+
+        Returns:
+            The new snapshot
+        """
+        with self._publish_lock:
+            snapshot = DatasetSnapshot(df, self.version + 1)
+            self._current = snapshot
+        print(f"Published dataset snapshot v{snapshot.version} ({len(snapshot)} rows)")
+        return snapshot
+
+    def get_or_load(self, loader: Callable[[], pd.DataFrame]) -> DatasetSnapshot:
+        """Current snapshot, publishing ``loader()`` first if there is none yet."""
+        snapshot = self._current
+        if snapshot is not None:
+            return snapshot
+        with self._publish_lock:
+            if self._current is None:
+                self._current = DatasetSnapshot(loader(), 1)
+                print(f"Published dataset snapshot v1 ({len(self._current)} rows)")
+            return self._current
+
+    def get_data(self) -> pd.DataFrame:
+        """Read-only view of the current snapshot."""
+        snapshot = self._current
+        if snapshot is None:
+            raise ValueError("No dataset snapshot has been published yet")
+        return snapshot.frame
@@ -0,0 +1,169 @@
+"""Synthetic cellular network dataset generator.
+
+Produces data with the same raw schema as the Kaggle cellular network analysis
+dataset, so it can be fed straight into ``DataPreprocessor.preprocess`` for
+benchmarking and offline development without network access.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import NETWORK_TYPES, TIME_INTERVAL_MINUTES
+
+
+# Baseline signal strength (dBm) and throughput (Mbps) per network type
+NETWORK_PROFILES = {
+    "3G": {"signal": -95.0, "throughput": 2.0, "latency": 120.0},
+    "4G": {"signal": -85.0, "throughput": 15.0, "latency": 60.0},
+    "LTE": {"signal": -82.0, "throughput": 25.0, "latency": 45.0},
+    "5G": {"signal": -75.0, "throughput": 120.0, "latency": 15.0},
+}
+
+# Relative share of measurements per network type
+NETWORK_SHARES = {"3G": 0.15, "4G": 0.35, "LTE": 0.30, "5G": 0.20}
+
+# Bounding box the synthetic localities are scattered in
+LATITUDE_RANGE = (25.0, 27.0)
+LONGITUDE_RANGE = (84.0, 87.0)
+
+RAW_COLUMNS = [
+    "Timestamp",
+    "Latitude",
+    "Longitude",
+    "Signal Strength (dBm)",
+    "Signal Quality (%)",
+    "Data Throughput (Mbps)",
+    "Latency",
+    "Network Type",
+    "Locality",
+]
+
+
+def parse_row_count(value: str) -> int:
+    """Parse a row count such as ``10k``, ``1m`` or ``2500``."""
+    value = str(value).strip().lower().replace("_", "")
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def generate_cellular_dataset(n_rows: int,
+                              n_localities: int = 20,
+                              start: Optional[datetime] = None,
+                              missing_rate: float = 0.01,
+                              seed: int = 42,
+                              row_offset: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic raw cellular measurement dataset.
+
+    Rows are in timestamp order. Every interval of ``TIME_INTERVAL_MINUTES``
+    holds one measurement per locality, each on a randomly chosen network type.
+    Signal strength follows a daily cycle, throughput and latency follow the
+    signal, and a small fraction of numeric values is blanked out to exercise
+    the forward-fill handling.
+
+    Args:
+        n_rows: Number of rows to generate
+        n_localities: Number of distinct localities
+        start: Timestamp of the first interval (default 2023-01-01)
+        missing_rate: Fraction of numeric values replaced by NaN
+        seed: Random seed
+        row_offset: Global index of the first row, used to generate a large
+            dataset in consecutive chunks
+
+    Returns:
+        pd.DataFrame: Raw dataset using the Kaggle column names
+    """
+    start = start or datetime(2023, 1, 1)
+    rng = np.random.default_rng((seed, row_offset))
+
+    row_index = np.arange(row_offset, row_offset + n_rows, dtype=np.int64)
+    interval = row_index // n_localities
+    locality_idx = (row_index % n_localities).astype(np.int32)
+
+    timestamps = (np.datetime64(start, "s")
+                  + interval * np.timedelta64(TIME_INTERVAL_MINUTES * 60, "s"))
+    hours = (interval * TIME_INTERVAL_MINUTES / 60.0) % 24
+
+    # Locality centres are fixed by ``seed`` so every chunk agrees on them
+    centre_rng = np.random.default_rng(seed)
+    centres_lat = centre_rng.uniform(*LATITUDE_RANGE, size=n_localities)
+    centres_lon = centre_rng.uniform(*LONGITUDE_RANGE, size=n_localities)
+    locality_bias = centre_rng.normal(0.0, 4.0, size=n_localities)
+    locality_names = np.array([f"Locality_{i + 1:03d}" for i in range(n_localities)])
+
+    network_types = [nt for nt in NETWORK_TYPES if nt in NETWORK_PROFILES]
+    shares = np.array([NETWORK_SHARES[nt] for nt in network_types])
+    network_idx = rng.choice(len(network_types), size=n_rows, p=shares / shares.sum())
+    base_signal = np.array([NETWORK_PROFILES[nt]["signal"] for nt in network_types])
+    base_throughput = np.array([NETWORK_PROFILES[nt]["throughput"] for nt in network_types])
+    base_latency = np.array([NETWORK_PROFILES[nt]["latency"] for nt in network_types])
+
+    # Evening peak degrades signal, overnight lull improves it
+    daily_cycle = -6.0 * np.sin(2 * np.pi * (hours - 13.0) / 24.0)
+    signal = (base_signal[network_idx] + locality_bias[locality_idx] + daily_cycle
+              + rng.normal(0.0, 3.0, size=n_rows))
+    signal_factor = np.clip((signal + 120.0) / 50.0, 0.05, 1.5)
+    throughput = base_throughput[network_idx] * signal_factor * rng.lognormal(0.0, 0.25, size=n_rows)
+    latency = base_latency[network_idx] / signal_factor * rng.lognormal(0.0, 0.15, size=n_rows)
+
+    df = pd.DataFrame({
+        "Timestamp": timestamps,
+        "Latitude": centres_lat[locality_idx] + rng.normal(0.0, 0.002, size=n_rows),
+        "Longitude": centres_lon[locality_idx] + rng.normal(0.0, 0.002, size=n_rows),
+        "Signal Strength (dBm)": signal.round(2),
+        "Signal Quality (%)": np.zeros(n_rows),
+        "Data Throughput (Mbps)": throughput.round(3),
+        "Latency": latency.round(2),
+        "Network Type": pd.Categorical.from_codes(network_idx, categories=network_types),
+        "Locality": pd.Categorical.from_codes(locality_idx, categories=locality_names),
+    }, columns=RAW_COLUMNS)
+
+    if missing_rate > 0:
+        for col in ["Signal Strength (dBm)", "Data Throughput (Mbps)", "Latency"]:
+            mask = rng.random(n_rows) < missing_rate
+            df.loc[mask, col] = np.nan
+
+    return df
+
+
+def write_cellular_csv(path: Path,
+                       n_rows: int,
+                       chunk_size: int = 1_000_000,
+                       **kwargs) -> Path:
+    """
+    Write a synthetic dataset to CSV in bounded chunks.
+
+    Only one chunk is held in memory at a time, so datasets far larger than
+    RAM can be produced.
+
+    Args:
+        path: Destination CSV path
+        n_rows: Total number of rows
+        chunk_size: Rows generated per chunk
+        **kwargs: Forwarded to ``generate_cellular_dataset``
+
+    Returns:
+        Path: The written CSV path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    while written < n_rows:
+        rows = min(chunk_size, n_rows - written)
+        chunk = generate_cellular_dataset(rows, row_offset=written, **kwargs)
+        chunk.to_csv(path, mode="w" if written == 0 else "a",
+                     header=written == 0, index=False)
+        written += rows
+
+    print(f"Wrote {written} synthetic rows to {path}")
+    return path
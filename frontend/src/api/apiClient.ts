@@ -31,19 +31,23 @@ export const getDataSummary = async () => {
   return response.data;
 };
 
+// Forecasts and trends longer than this are downsampled server-side
+export const MAX_CHART_POINTS = 500;
+
 // Feature 1: Signal Strength Prediction
 export const predictSignalStrength = async (locality: string, networkType: string, hoursAhead: number = 24) => {
   const response = await apiClient.post('/predict/signal-strength', {
     locality,
     network_type: networkType,
     hours_ahead: hoursAhead,
+    max_points: MAX_CHART_POINTS,
   });
   return response.data;
 };
 
 // Feature 2: Network Usage Analysis
 export const analyzeNetworkUsage = async (locality?: string, startDate?: string, endDate?: string) => {
-  const params: any = {};
+  const params: any = { max_points: MAX_CHART_POINTS };
   if (locality) params.locality = locality;
   if (startDate) params.start_date = startDate;
   if (endDate) params.end_date = endDate;
@@ -75,6 +79,7 @@ export const predictThroughput = async (locality: string, networkType: string, h
     locality,
     network_type: networkType,
     hours_ahead: hoursAhead,
+    max_points: MAX_CHART_POINTS,
   });
   return response.data;
 };